@@ -0,0 +1,44 @@
+# benchmark_pool.py
+# 개체 풀 사용 전/후의 틱 처리 속도, GC 일시 정지 시간, 풀 적중률 비교
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import constants as const
+from benchmark_stepping import scale_initial_population
+from creature_pool import GCPauseMonitor
+from simulation import Simulation
+
+def benchmark(use_creature_pool, ticks, seed):
+    const.STATS_EXPORT_ON_EXIT = False # 벤치마크 실행은 통계 파일을 남기지 않음
+    random.seed(seed)
+    simulation = Simulation(headless=True, use_creature_pool=use_creature_pool)
+    gc_monitor = GCPauseMonitor()
+    gc_monitor.start()
+    start = time.perf_counter()
+    simulation.run_headless(ticks)
+    elapsed = time.perf_counter() - start
+    gc_monitor.stop()
+    return simulation, elapsed, gc_monitor
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Creature pool benchmark")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--scale", type=float, default=10.0, help="초기 개체 수 배율")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.font.init()
+    scale_initial_population(args.scale)
+
+    for use_pool in (False, True):
+        simulation, elapsed, gc_monitor = benchmark(use_pool, args.ticks, args.seed)
+        print(f"=== Pool {'ON' if use_pool else 'OFF'}: {args.ticks} ticks in {elapsed:.2f}s "
+              f"({elapsed / args.ticks * 1000:.3f} ms/tick) ===")
+        print(gc_monitor.summary())
+        if simulation.creature_pool: print(simulation.creature_pool.summary())
+    pygame.quit()
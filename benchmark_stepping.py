@@ -0,0 +1,49 @@
+# benchmark_stepping.py
+# 순차 진행과 레드/블랙 병렬 진행의 틱 처리 속도 비교
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import constants as const
+from simulation import Simulation
+
+def scale_initial_population(scale):
+    """초기 개체 수와 에너지 풀을 scale 배로 늘립니다 (벤치마크용)."""
+    for sid in "ABCDEFGHI":
+        name = f"CREATURE_{sid}_INITIAL_COUNT"
+        setattr(const, name, int(getattr(const, name) * scale))
+    const.INITIAL_GLOBAL_ENERGY_POOL *= scale
+    const.CREATURE_A_BASE_CREATION_COUNT *= scale
+
+def benchmark(stepping_mode, ticks, seed):
+    const.STATS_EXPORT_ON_EXIT = False # 벤치마크 실행은 통계 파일을 남기지 않음
+    random.seed(seed)
+    simulation = Simulation(headless=True, stepping_mode=stepping_mode)
+    start = time.perf_counter()
+    simulation.run_headless(ticks)
+    elapsed = time.perf_counter() - start
+    population = sum(len(creature_list) for creature_list in simulation._get_all_creature_lists())
+    return elapsed, population
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Trophic stepping benchmark")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--scale", type=float, default=50.0, help="초기 개체 수 배율")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.font.init()
+    scale_initial_population(args.scale)
+
+    results = {}
+    for mode in ("sequential", "redblack"):
+        elapsed, population = benchmark(mode, args.ticks, args.seed)
+        results[mode] = elapsed
+        print(f"{mode:>10}: {args.ticks} ticks in {elapsed:.2f}s "
+              f"({args.ticks / elapsed:.1f} ticks/s, final population {population})")
+    print(f"Speedup (redblack vs sequential): x{results['sequential'] / results['redblack']:.2f}")
+    pygame.quit()
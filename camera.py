@@ -0,0 +1,59 @@
+# camera.py
+import pygame
+import constants as const
+
+class Camera:
+    """월드 좌표를 화면 뷰포트로 변환하는 카메라 (이동/확대 지원)"""
+    def __init__(self, viewport_rect, world_width, world_height):
+        self.viewport = pygame.Rect(viewport_rect)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.zoom = 1.0
+        self.x = 0.0 # 뷰포트 왼쪽 위 모서리의 월드 좌표
+        self.y = 0.0
+        self.reset()
+
+    def reset(self):
+        """월드 전체가 뷰포트에 들어오도록 맞춥니다."""
+        fit_zoom = min(self.viewport.width / self.world_width, self.viewport.height / self.world_height)
+        self.zoom = max(const.CAMERA_ZOOM_MIN, min(const.CAMERA_ZOOM_MAX, fit_zoom))
+        self.x = 0.0; self.y = 0.0
+        self._clamp()
+
+    def _clamp(self):
+        view_w = self.viewport.width / self.zoom
+        view_h = self.viewport.height / self.zoom
+        # 월드가 뷰포트보다 작으면 가운데 정렬, 크면 월드 밖으로 나가지 않게 제한
+        if view_w >= self.world_width: self.x = (self.world_width - view_w) / 2
+        else: self.x = max(0.0, min(self.x, self.world_width - view_w))
+        if view_h >= self.world_height: self.y = (self.world_height - view_h) / 2
+        else: self.y = max(0.0, min(self.y, self.world_height - view_h))
+
+    def pan(self, dx_screen, dy_screen):
+        """화면 픽셀 단위로 카메라를 이동합니다."""
+        self.x += dx_screen / self.zoom
+        self.y += dy_screen / self.zoom
+        self._clamp()
+
+    def zoom_at(self, factor, screen_pos=None):
+        """screen_pos(기본: 뷰포트 중앙) 아래의 월드 지점을 고정한 채 확대/축소합니다."""
+        if screen_pos is None: screen_pos = self.viewport.center
+        anchor_x, anchor_y = self.screen_to_world(*screen_pos)
+        self.zoom = max(const.CAMERA_ZOOM_MIN, min(const.CAMERA_ZOOM_MAX, self.zoom * factor))
+        self.x = anchor_x - (screen_pos[0] - self.viewport.left) / self.zoom
+        self.y = anchor_y - (screen_pos[1] - self.viewport.top) / self.zoom
+        self._clamp()
+
+    def world_to_screen(self, wx, wy):
+        return (self.viewport.left + (wx - self.x) * self.zoom,
+                self.viewport.top + (wy - self.y) * self.zoom)
+
+    def screen_to_world(self, sx, sy):
+        return (self.x + (sx - self.viewport.left) / self.zoom,
+                self.y + (sy - self.viewport.top) / self.zoom)
+
+    def visible_world_rect(self):
+        """뷰포트에 보이는 월드 영역 (left, top, right, bottom)"""
+        return (self.x, self.y,
+                self.x + self.viewport.width / self.zoom,
+                self.y + self.viewport.height / self.zoom)
@@ -0,0 +1,97 @@
+# capture.py
+import os
+import queue
+import threading
+import pygame
+import constants as const
+
+# pygame 2.1.3 이전 버전에는 tobytes가 없음
+_surface_to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+class FrameCapture:
+    """렌더링된 프레임을 제한된 큐에 복사하고, 워커 스레드가 PNG 시퀀스 또는 raw 비디오 스트림으로 기록합니다.
+
+    메인 루프는 프레임을 바이트로 복사만 하고 인코딩은 워커가 담당하므로,
+    큐가 가득 차도 (drop_when_full=True 이면) 시뮬레이션은 멈추지 않고 해당 프레임만 버립니다.
+    """
+    def __init__(self, output_dir, mode='png', size=None, queue_size=None, num_workers=None, drop_when_full=None):
+        if mode not in ('png', 'raw'):
+            raise ValueError(f"Unknown capture mode: {mode}")
+        self.output_dir = output_dir
+        self.mode = mode
+        self.size = tuple(size) if size else None
+        self.drop_when_full = const.CAPTURE_DROP_WHEN_FULL if drop_when_full is None else drop_when_full
+        self.frame_queue = queue.Queue(maxsize=queue_size or const.CAPTURE_QUEUE_SIZE)
+
+        self.frames_submitted = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._scaled_surface = None # 해상도 변환용 버퍼 (매 프레임 재할당 방지)
+        self._raw_file = None
+        self._lock = threading.Lock()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == 'raw':
+            # raw 스트림은 프레임 순서가 중요하므로 단일 기록 스레드만 사용
+            self._raw_file = open(os.path.join(self.output_dir, const.CAPTURE_RAW_FILENAME), "wb")
+            worker_count = 1
+        else:
+            worker_count = num_workers or const.CAPTURE_NUM_WORKERS
+
+        self._workers = [threading.Thread(target=self._worker_loop, name=f"capture-{i}", daemon=True)
+                         for i in range(worker_count)]
+        for worker in self._workers: worker.start()
+
+    def submit(self, surface):
+        """surface를 복사해 큐에 넣습니다. 프레임이 버려지면 False를 반환합니다."""
+        if self.size and surface.get_size() != self.size:
+            if self._scaled_surface is None:
+                self._scaled_surface = pygame.Surface(self.size)
+            pygame.transform.smoothscale(surface, self.size, self._scaled_surface)
+            surface = self._scaled_surface
+
+        frame_size = surface.get_size()
+        if self.size is None: self.size = frame_size # raw 스트림은 첫 프레임 크기로 고정
+        job = (self.frames_submitted, frame_size, _surface_to_bytes(surface, "RGB"))
+        self.frames_submitted += 1
+
+        if self.drop_when_full:
+            try: self.frame_queue.put_nowait(job)
+            except queue.Full:
+                self.frames_dropped += 1
+                return False
+        else:
+            self.frame_queue.put(job)
+        return True
+
+    def _worker_loop(self):
+        while True:
+            job = self.frame_queue.get()
+            if job is None: break
+            frame_index, frame_size, data = job
+            try:
+                if self.mode == 'raw':
+                    self._raw_file.write(data)
+                else:
+                    frame_surface = pygame.image.frombuffer(data, frame_size, "RGB")
+                    filename = f"{const.CAPTURE_FILENAME_PREFIX}{frame_index:06d}.png"
+                    pygame.image.save(frame_surface, os.path.join(self.output_dir, filename))
+                with self._lock: self.frames_written += 1
+            except (pygame.error, OSError) as e:
+                print(f"Capture: failed to write frame {frame_index}: {e}")
+
+    def close(self):
+        """남은 프레임을 모두 기록하고 워커를 종료합니다."""
+        for _ in self._workers: self.frame_queue.put(None)
+        for worker in self._workers: worker.join()
+        if self._raw_file:
+            self._raw_file.close()
+            if self.size:
+                # ffmpeg 등에서 raw 스트림을 읽을 때 필요한 정보
+                width, height = self.size
+                info_path = os.path.join(self.output_dir, const.CAPTURE_RAW_FILENAME + ".txt")
+                with open(info_path, "w") as info_file:
+                    info_file.write(f"ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} "
+                                    f"-r {const.FPS} -i {const.CAPTURE_RAW_FILENAME} capture.mp4\n")
+        print(f"Capture: {self.frames_written} frames written to {self.output_dir} "
+              f"({self.frames_dropped} dropped)")
@@ -11,6 +11,10 @@ GRAPH_AREA_X_START = SIMULATION_AREA_WIDTH
 SCREEN_WIDTH = SIMULATION_AREA_WIDTH + GRAPH_AREA_WIDTH
 SCREEN_HEIGHT = SIMULATION_AREA_HEIGHT
 
+# 월드 크기 (화면 크기와 독립, 카메라로 이동/확대)
+WORLD_WIDTH = SIMULATION_AREA_WIDTH
+WORLD_HEIGHT = SIMULATION_AREA_HEIGHT
+
 FPS = 60
 SIMULATION_TICK_RATE = 0.005
 
@@ -163,12 +167,97 @@ GRAPH_BG_COLOR = (20, 20, 20)
 GRAPH_TEXT_COLOR = GREY
 GRAPH_FONT_SIZE = 16
 
+# --- 카메라 / 공간 인덱스 설정 ---
+CAMERA_ZOOM_MIN = 0.02
+CAMERA_ZOOM_MAX = 8.0
+CAMERA_ZOOM_STEP = 1.25 # 휠/키 한 번에 곱해지는 배율
+SPATIAL_GRID_CELL_SIZE = 64 # 렌더링 컬링용 격자 셀 크기 (월드 좌표)
+
 # --- 시뮬레이션 제어 ---
 FAST_FORWARD_FACTORS = [0.3, 2.0, 4.0]
 
+# --- 병렬 영양 단계 진행 설정 ---
+STEPPING_MODE = 'sequential' # 'sequential' 또는 'redblack'
+PARALLEL_STEPPING_WORKERS = 4
+
+# --- 개체 풀 설정 ---
+CREATURE_POOL_ENABLED = True # 죽은 개체를 생성/번식에 재사용
+CREATURE_POOL_MAX_PER_SPECIES = 10000 # 종별 free-list 최대 크기
+
+# --- 슈퍼 개체 설정 (super_individual.py) ---
+SUPER_INDIVIDUAL_A_ENABLED = False # A 에이전트 하나가 여러 실제 개체를 대표
+SUPER_INDIVIDUAL_A_MAX_AGENTS = 100000 # A 에이전트 수 예산 (넘으면 가까운 에이전트끼리 합침)
+SUPER_INDIVIDUAL_SPLIT_BELOW_FRACTION = 0.5 # 에이전트 수가 예산의 이 비율 미만이면 무거운 에이전트를 나눔
+SUPER_INDIVIDUAL_REBALANCE_PERIOD_TICKS = 10 # 합치기/나누기 검사 간격 (틱)
+
+# --- 실행 통계 설정 (run_statistics.py) ---
+STATS_OSCILLATION_HYSTERESIS = 0.5 # 진동 주기 판정 밴드 (표준편차 배수)
+STATS_EXPORT_ON_EXIT = True # 실행 종료 시 통계 요약을 JSON으로 저장 (main.py --no-export-stats로 끔, 벤치마크/튜너는 항상 끔)
+STATS_SAVE_PATH = "simulation_stats/"
+STATS_FILENAME_PREFIX = "run_stats_"
+
+# --- 전체 이력 저장소 설정 (history_store.py) ---
+HISTORY_STORE_GROW_RECORDS = 65536 # 파일을 늘릴 때 한 번에 예약하는 레코드 수
+HISTORY_EXPORT_MAX_POINTS = 20000 # 전체 이력 그래프 저장 시 최대 점 수 (초과하면 솎아냄)
+GRAPH_MIN_WINDOW_TICKS = 100 # 그래프 확대 시 최소 표시 틱 수
+
+# --- 적응형 품질 설정 (quality_controller.py) ---
+QUALITY_ADAPTIVE_ENABLED = True # 창 모드에서 프레임 시간에 맞춰 렌더링 품질 자동 조절 (Q 키로 켜기/끄기)
+QUALITY_TARGET_FPS = FPS
+# (그래프 갱신 간격, HUD 갱신 간격 (프레임), 개체 표본 간격, 프레임당 최대 틱 수), 0단계가 최고 품질
+QUALITY_LEVELS = (
+    (1, 1, 1, 1),
+    (4, 2, 1, 2),
+    (10, 5, 2, 4),
+    (30, 10, 4, 8),
+    (60, 20, 8, 16),
+)
+QUALITY_EMA_ALPHA = 0.2 # 프레임 시간 지수 이동 평균 계수
+QUALITY_DOWNGRADE_MARGIN = 1.15 # 평균 프레임 시간이 목표의 이 배수를 넘으면 품질을 낮춤
+QUALITY_UPGRADE_MARGIN = 0.9 # 한 단계 위의 예상 프레임 시간이 목표의 이 배수 아래면 품질을 높임
+QUALITY_RENDER_ESTIMATE_DECAY_MS = 5000 # 떠난 단계의 렌더링 시간 추정치가 현재 측정값으로 수렴하는 시간 (일시적 급증에 갇히지 않도록)
+QUALITY_ADJUST_COOLDOWN_MS = 500 # 단계를 바꾼 뒤 다시 바꾸기까지 최소 작업 시간 (느린 프레임에서도 빠르게 수렴)
+
 # --- 그래프 저장 설정 ---
 GRAPH_SAVE_PATH = "simulation_graphs/"
 GRAPH_FILENAME_PREFIX = "population_graph_"
 GRAPH_SAVE_DEFAULT_WIDTH = 1600 # 저장 그래프 너비 증가
 GRAPH_SAVE_DEFAULT_HEIGHT = 800 # 저장 그래프 높이 증가
-GRAPH_SAVE_X_PIXELS_PER_TICK = 1
\ No newline at end of file
+GRAPH_SAVE_X_PIXELS_PER_TICK = 1
+GRAPH_SAVE_STATUS_SECONDS = 5 # 저장 완료 메시지를 HUD에 표시하는 시간 (초)
+
+# --- 프레임 캡처 설정 ---
+CAPTURE_SAVE_PATH = "simulation_captures/"
+CAPTURE_FILENAME_PREFIX = "frame_"
+CAPTURE_RAW_FILENAME = "capture.rgb"
+CAPTURE_QUEUE_SIZE = 64 # 인코딩 대기 프레임 최대 수
+CAPTURE_NUM_WORKERS = 4 # PNG 인코딩 워커 수
+CAPTURE_DROP_WHEN_FULL = True # 큐가 가득 차면 프레임을 버림 (시뮬레이션을 멈추지 않음)
+CAPTURE_TICKS_PER_FRAME = 1 # 캡처 모드에서 프레임당 진행할 틱 수
+
+# --- 메모리 보고서 설정 ---
+MEMORY_REPORT_ENABLED = False # 시작 시 tracemalloc 추적 시작 (첫 보고서부터 초기 할당 포함)
+MEMORY_TRACE_FRAMES = 1 # tracemalloc이 기록할 스택 깊이
+MEMORY_REPORT_TOP_N = 10 # 스냅샷 차이 상위 항목 수
+
+# --- 운 조절기 튜너 설정 (luck_tuner.py) ---
+TUNER_NUM_CONFIGS = 27 # 첫 단계 후보 설정 수
+TUNER_MIN_TICKS = 300 # 첫 단계 실행 틱 수
+TUNER_MAX_TICKS = 8100 # 실행 틱 수 상한
+TUNER_ETA = 3 # 단계마다 상위 1/ETA만 남기고 틱 수를 ETA배로
+TUNER_SEEDS_PER_CONFIG = 2
+TUNER_EXTINCTION_PENALTY = 1.0 # 멸종 비율에 곱해지는 벌점
+TUNER_OUTPUT_PATH = "tuner_results/"
+TUNER_REPORT_FILENAME = "luck_tuner_report.txt"
+TUNER_OVERRIDE_FILENAME = "luck_override.json"
+
+# --- 골든 트레이스 비교 설정 (golden_trace.py) ---
+GOLDEN_LUCK_TOLERANCE = 1e-9
+GOLDEN_ENERGY_TOLERANCE = 1e-6
+GOLDEN_POSITION_TOLERANCE = 1e-6
+
+# --- 프로세스 분리 뷰어 설정 (shared_view.py) ---
+SHARED_VIEW_CAPACITY = 200000 # 공유 메모리에 게시할 최대 개체 수
+SHARED_VIEW_PUBLISH_EVERY_TICKS = 1 # 게시 간격 (틱)
+SHARED_VIEW_SHUTDOWN_TIMEOUT_S = 5.0
+SHARED_VIEW_READ_RETRIES = 3 # 읽는 도중 덮어써진 프레임을 다시 읽는 최대 횟수 (모두 실패하면 이전 화면 유지)
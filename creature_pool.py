@@ -0,0 +1,89 @@
+# creature_pool.py
+import gc
+import time
+from collections import defaultdict
+import constants as const
+
+class CreaturePool:
+    """종(클래스)별 free-list. 죽은 개체를 초기화해 생성/번식에 재사용해 할당 횟수를 줄입니다.
+
+    레드/블랙 병렬 진행에서는 스레드마다 서로 다른 종만 다루므로, 통계도 종별로 따로 셉니다.
+    """
+    def __init__(self, max_size_per_species=None):
+        self.max_size_per_species = max_size_per_species or const.CREATURE_POOL_MAX_PER_SPECIES
+        self.free_lists = defaultdict(list)
+        self.hits = defaultdict(int) # 재사용으로 처리된 요청 수
+        self.misses = defaultdict(int) # 새로 생성한 수
+        self.discarded = defaultdict(int) # 풀이 가득 차 버린 수
+
+    def acquire(self, creature_class, x, y, initial_luck):
+        free_list = self.free_lists[creature_class]
+        if free_list:
+            creature = free_list.pop()
+            creature.reset(x, y, initial_luck)
+            self.hits[creature_class] += 1
+            return creature
+        self.misses[creature_class] += 1
+        return creature_class(x, y, initial_luck)
+
+    def acquire_batch(self, creature_class, positions, initial_luck):
+        """positions의 각 위치에 개체를 한 번에 준비합니다."""
+        free_list = self.free_lists[creature_class]
+        reused_count = min(len(free_list), len(positions))
+        batch = free_list[len(free_list) - reused_count:]
+        del free_list[len(free_list) - reused_count:]
+        for creature, (x, y) in zip(batch, positions):
+            creature.reset(x, y, initial_luck)
+        batch.extend(creature_class(x, y, initial_luck) for x, y in positions[reused_count:])
+        self.hits[creature_class] += reused_count
+        self.misses[creature_class] += len(positions) - reused_count
+        return batch
+
+    def release(self, creature):
+        free_list = self.free_lists[type(creature)]
+        if len(free_list) < self.max_size_per_species: free_list.append(creature)
+        else: self.discarded[type(creature)] += 1
+
+    def hit_rate(self):
+        hits = sum(self.hits.values())
+        total = hits + sum(self.misses.values())
+        return hits / total if total else 0.0
+
+    def free_count(self):
+        return sum(len(free_list) for free_list in self.free_lists.values())
+
+    def summary(self):
+        lines = [f"Creature pool: hit rate {self.hit_rate() * 100:.1f}%, {self.free_count()} free"]
+        for creature_class in sorted(set(self.hits) | set(self.misses), key=lambda c: c.__name__):
+            lines.append(f"  {creature_class.__name__}: hits {self.hits[creature_class]}, "
+                         f"misses {self.misses[creature_class]}, free {len(self.free_lists[creature_class])}, "
+                         f"discarded {self.discarded[creature_class]}")
+        return "\n".join(lines)
+
+class GCPauseMonitor:
+    """gc.callbacks로 가비지 컬렉션 일시 정지 시간을 측정합니다."""
+    def __init__(self):
+        self.pause_count = 0
+        self.total_pause_s = 0.0
+        self.max_pause_s = 0.0
+        self._start_time = None
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start_time = time.perf_counter()
+        elif self._start_time is not None:
+            pause = time.perf_counter() - self._start_time
+            self.pause_count += 1
+            self.total_pause_s += pause
+            self.max_pause_s = max(self.max_pause_s, pause)
+            self._start_time = None
+
+    def start(self):
+        if self._callback not in gc.callbacks: gc.callbacks.append(self._callback)
+
+    def stop(self):
+        if self._callback in gc.callbacks: gc.callbacks.remove(self._callback)
+
+    def summary(self):
+        return (f"GC pauses: {self.pause_count}, total {self.total_pause_s * 1000:.1f} ms, "
+                f"max {self.max_pause_s * 1000:.2f} ms")
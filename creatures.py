@@ -10,25 +10,58 @@ def calculate_distance_objects(obj1, obj2):
     if not obj1 or not obj2: return float('inf')
     return math.hypot(obj1.x - obj2.x, obj1.y - obj2.y)
 
+def create_creatures_bulk(creature_class, xs, ys, initial_luck):
+    """좌표 리스트로 개체를 한 번에 생성합니다. 좌표는 이미 월드 안에 있다고 보고 개체별 __init__/confine을 생략합니다."""
+    if not xs: return []
+    template = creature_class(xs[0], ys[0], initial_luck) # 종 공통 속성을 가진 원형
+    state = template.__dict__
+    new_instance = object.__new__
+    creatures = [template]
+    for x, y in zip(xs[1:], ys[1:]):
+        creature = new_instance(creature_class)
+        creature.__dict__.update(state)
+        creature.x = x; creature.y = y
+        creatures.append(creature)
+    return creatures
+
+def spawn_creature(creature_class, x, y, initial_luck, pool=None):
+    """pool(CreaturePool)이 있으면 재사용 개체를, 없으면 새 개체를 반환합니다."""
+    if pool is not None: return pool.acquire(creature_class, x, y, initial_luck)
+    return creature_class(x, y, initial_luck)
+
 class Creature:
     def __init__(self, x, y, radius, color, species_name, initial_luck, fixed_energy_value):
-        self.id = uuid.uuid4()
-        self.x = float(x)
-        self.y = float(y)
         self.radius = int(radius)
         self.color = color
+        self.species_name = species_name
+        self.fixed_energy_value = float(fixed_energy_value)
+        self.reset(x, y, initial_luck)
+
+    def reset(self, x, y, initial_luck):
+        """개체별 상태를 새로 태어난 상태로 초기화합니다 (개체 풀 재사용 시에도 호출)."""
+        self._id = None # id는 처음 접근할 때 생성 (uuid4 생성이 개체 생성 비용의 대부분)
+        self.x = float(x)
+        self.y = float(y)
         self.luck = float(initial_luck)
         self.age_ticks = 0
         self.is_alive = True
-        self.species_name = species_name
-        self.fixed_energy_value = float(fixed_energy_value)
-        self.current_energy_level = float(fixed_energy_value)
+        self.weight = 1 # 이 개체가 대표하는 실제 개체 수 (슈퍼 개체 모드, super_individual.py)
+        self.current_energy_level = self.fixed_energy_value
         self.eaten_prey_count = 0 # 모든 포식자가 가질 수 있도록 Creature 클래스로 이동
-        self.confine_to_screen()
+        self.confine_to_world()
+
+    @property
+    def id(self):
+        if self._id is None: self._id = uuid.uuid4()
+        return self._id
 
-    def draw(self, screen):
+    def draw(self, screen, camera=None):
         if self.is_alive:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+            if camera is None:
+                pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+            else: # 카메라 좌표계로 변환 (줌 반영)
+                sx, sy = camera.world_to_screen(self.x, self.y)
+                pygame.draw.circle(screen, self.color, (int(sx), int(sy)), max(1, int(self.radius * camera.zoom)))
 
     def update_age(self):
         if self.is_alive:
@@ -41,11 +74,11 @@ class Creature:
             angle = random.uniform(0, 2 * math.pi)
             self.x += math.cos(angle) * speed
             self.y += math.sin(angle) * speed
-            self.confine_to_screen()
+            self.confine_to_world()
 
-    def confine_to_screen(self):
-        self.x = max(self.radius, min(self.x, const.SIMULATION_AREA_WIDTH - self.radius))
-        self.y = max(self.radius, min(self.y, const.SIMULATION_AREA_HEIGHT - self.radius))
+    def confine_to_world(self):
+        self.x = max(self.radius, min(self.x, const.WORLD_WIDTH - self.radius))
+        self.y = max(self.radius, min(self.y, const.WORLD_HEIGHT - self.radius))
 
     def get_current_speed(self): # 기본 구현, 하위 클래스에서 오버라이드 가능
         if hasattr(self, 'base_speed'):
@@ -55,7 +88,10 @@ class Creature:
     def _base_hunt_logic(self, target): # 포식자 클래스에서 사용할 공통 로직
         if not self.is_alive or not target or not target.is_alive: return False
         if calculate_distance_objects(self,target) <= (self.radius+target.radius):
-            target.is_alive=False
+            # 슈퍼 개체는 대표하는 개체 중 하나만 잡아먹히고, 가중치가 0이 되면 죽음
+            target.weight-=1
+            if target.weight<=0: target.is_alive=False
+            target.current_energy_level-=target.fixed_energy_value
             self.eaten_prey_count+=1
             self.current_energy_level+=target.fixed_energy_value
             return True
@@ -90,13 +126,13 @@ class CreatureB(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_a): return self._base_hunt_logic(target_a)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_B_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_B_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureB(sx,sy,self.luck)
+            return spawn_creature(CreatureB,sx,sy,self.luck,pool)
         return None
 
 class CreatureC(Creature):
@@ -118,13 +154,13 @@ class CreatureC(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_b): return self._base_hunt_logic(target_b) # Hunts B
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_C_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_C_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureC(sx,sy,self.luck)
+            return spawn_creature(CreatureC,sx,sy,self.luck,pool)
         return None
 
 # --- New Fixed Species ---
@@ -146,13 +182,13 @@ class CreatureD(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_c): return self._base_hunt_logic(target_c)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_D_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_D_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureD(sx,sy,self.luck)
+            return spawn_creature(CreatureD,sx,sy,self.luck,pool)
         return None
 
 class CreatureE(Creature):
@@ -173,13 +209,13 @@ class CreatureE(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_d): return self._base_hunt_logic(target_d)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_E_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_E_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureE(sx,sy,self.luck)
+            return spawn_creature(CreatureE,sx,sy,self.luck,pool)
         return None
 
 class CreatureF(Creature):
@@ -200,13 +236,13 @@ class CreatureF(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_e): return self._base_hunt_logic(target_e)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_F_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_F_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureF(sx,sy,self.luck)
+            return spawn_creature(CreatureF,sx,sy,self.luck,pool)
         return None
 
 class CreatureG(Creature):
@@ -227,13 +263,13 @@ class CreatureG(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_f): return self._base_hunt_logic(target_f)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_G_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_G_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureG(sx,sy,self.luck)
+            return spawn_creature(CreatureG,sx,sy,self.luck,pool)
         return None
 
 class CreatureH(Creature):
@@ -254,13 +290,13 @@ class CreatureH(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_g): return self._base_hunt_logic(target_g)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_H_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_H_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureH(sx,sy,self.luck)
+            return spawn_creature(CreatureH,sx,sy,self.luck,pool)
         return None
 
 class CreatureI(Creature):
@@ -281,11 +317,11 @@ class CreatureI(Creature):
         if target and target.is_alive:
             a=math.atan2(target.y-self.y,target.x-self.x); self.x+=s*math.cos(a); self.y+=s*math.sin(a)
         else: self.move_randomly(s)
-        self.confine_to_screen()
+        self.confine_to_world()
     def hunt(self, target_h): return self._base_hunt_logic(target_h)
     def can_reproduce(self): return self.eaten_prey_count >= const.CREATURE_I_PREY_COUNT_FOR_REPRODUCTION
-    def attempt_reproduction(self):
+    def attempt_reproduction(self, pool=None):
         if random.random()<(const.CREATURE_I_BASE_REPRODUCTION_SUCCESS_RATE*self.luck):
             self.eaten_prey_count=0; sx=self.x+random.uniform(-self.radius*2,self.radius*2); sy=self.y+random.uniform(-self.radius*2,self.radius*2)
-            return CreatureI(sx,sy,self.luck)
+            return spawn_creature(CreatureI,sx,sy,self.luck,pool)
         return None
\ No newline at end of file
@@ -0,0 +1,136 @@
+# golden_trace.py
+# 기준 엔진(순차 진행 Simulation)과 후보 엔진을 같은 시드로 실행해 틱/단계별 상태를 비교
+import argparse
+import os
+import random
+import time
+
+import pygame
+import constants as const
+from simulation import Simulation
+
+# 비교 가능한 엔진 설정. 새 엔진은 여기에 Simulation 생성 함수를 추가
+ENGINE_FACTORIES = {
+    'reference': lambda: Simulation(headless=True, stepping_mode='sequential', use_creature_pool=False),
+    'pool': lambda: Simulation(headless=True, stepping_mode='sequential', use_creature_pool=True),
+    'redblack': lambda: Simulation(headless=True, stepping_mode='redblack', use_creature_pool=False),
+}
+
+def capture_state(simulation, include_positions=False):
+    """비교용 상태 스냅샷 (개체 수, 운, 에너지 풀, 선택적으로 위치)"""
+    state = {
+        'population': simulation._get_population_counts(),
+        'luck': dict(simulation.species_luck),
+        'energy': simulation.global_energy_pool,
+    }
+    if include_positions:
+        state['positions'] = {sid: [(c.x, c.y) for c in getattr(simulation, f"creatures_{sid.lower()}")]
+                              for sid in simulation.species_ids}
+    return state
+
+def compare_states(reference, candidate, tolerances):
+    """첫 번째 불일치 (항목, 종, 기준 값, 후보 값)를 반환합니다. 일치하면 None."""
+    for sid, ref_count in reference['population'].items():
+        if candidate['population'][sid] != ref_count:
+            return ('population', sid, ref_count, candidate['population'][sid])
+    if abs(reference['energy'] - candidate['energy']) > tolerances['energy']:
+        return ('energy', None, reference['energy'], candidate['energy'])
+    for sid, ref_luck in reference['luck'].items():
+        if abs(ref_luck - candidate['luck'][sid]) > tolerances['luck']:
+            return ('luck', sid, ref_luck, candidate['luck'][sid])
+    if 'positions' in reference:
+        for sid, ref_positions in reference['positions'].items():
+            for index, ((rx, ry), (cx, cy)) in enumerate(zip(ref_positions, candidate['positions'][sid])):
+                if abs(rx - cx) > tolerances['position'] or abs(ry - cy) > tolerances['position']:
+                    return ('position', f"{sid}[{index}]", (rx, ry), (cx, cy))
+    return None
+
+class Divergence:
+    def __init__(self, tick, phase, field, species, reference_value, candidate_value):
+        self.tick = tick
+        self.phase = phase # 불일치가 처음 나타난 틱 단계 (Simulation._get_tick_phases 이름)
+        self.field = field
+        self.species = species
+        self.reference_value = reference_value
+        self.candidate_value = candidate_value
+
+    def __repr__(self):
+        where = f" ({self.species})" if self.species else ""
+        return (f"Divergence at tick {self.tick}, phase '{self.phase}': {self.field}{where} "
+                f"reference={self.reference_value} candidate={self.candidate_value}")
+
+class GoldenTraceHarness:
+    """두 엔진을 같은 시드/초기 상태에서 한 틱씩 번갈아 진행하며 단계마다 상태를 비교합니다.
+
+    엔진마다 전역 random 상태를 따로 저장/복원하므로, 같은 프로세스에서 번갈아 실행해도
+    각 엔진은 단독 실행과 같은 난수열을 사용합니다.
+    """
+    def __init__(self, reference_factory, candidate_factory, seed=0, compare_positions=False, tolerances=None):
+        self.compare_positions = compare_positions
+        self.tolerances = {'luck': const.GOLDEN_LUCK_TOLERANCE, 'energy': const.GOLDEN_ENERGY_TOLERANCE,
+                           'position': const.GOLDEN_POSITION_TOLERANCE}
+        if tolerances: self.tolerances.update(tolerances)
+
+        random.seed(seed)
+        self.reference = reference_factory()
+        self._reference_rng_state = random.getstate()
+        random.seed(seed)
+        self.candidate = candidate_factory()
+        self._candidate_rng_state = random.getstate()
+
+    def run(self, num_ticks):
+        """첫 불일치(Divergence)를 반환합니다. num_ticks 동안 일치하면 None."""
+        initial_mismatch = compare_states(capture_state(self.reference, self.compare_positions),
+                                          capture_state(self.candidate, self.compare_positions), self.tolerances)
+        if initial_mismatch: return Divergence(0, 'init', *initial_mismatch)
+
+        try:
+            for _ in range(num_ticks):
+                divergence = self._step()
+                if divergence: return divergence
+            return None
+        finally:
+            self.reference.close()
+            self.candidate.close()
+
+    def _step(self):
+        reference_states = {}
+        def record(phase_name):
+            reference_states[phase_name] = capture_state(self.reference, self.compare_positions)
+        random.setstate(self._reference_rng_state)
+        self.reference._advance_tick(phase_callback=record)
+        self._reference_rng_state = random.getstate()
+
+        divergence = []
+        def check(phase_name):
+            if divergence: return
+            mismatch = compare_states(reference_states[phase_name],
+                                      capture_state(self.candidate, self.compare_positions), self.tolerances)
+            if mismatch: divergence.append(Divergence(self.candidate.current_tick, phase_name, *mismatch))
+        random.setstate(self._candidate_rng_state)
+        self.candidate._advance_tick(phase_callback=check)
+        self._candidate_rng_state = random.getstate()
+        return divergence[0] if divergence else None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Golden-trace equivalence check")
+    parser.add_argument("--candidate", choices=sorted(ENGINE_FACTORIES), default="pool")
+    parser.add_argument("--reference", choices=sorted(ENGINE_FACTORIES), default="reference")
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--positions", action="store_true", help="개체 위치까지 비교")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.font.init()
+
+    harness = GoldenTraceHarness(ENGINE_FACTORIES[args.reference], ENGINE_FACTORIES[args.candidate],
+                                 seed=args.seed, compare_positions=args.positions)
+    start = time.perf_counter()
+    result = harness.run(args.ticks)
+    elapsed = time.perf_counter() - start
+    if result is None:
+        print(f"OK: '{args.candidate}' matches '{args.reference}' for {args.ticks} ticks ({elapsed:.1f}s)")
+    else:
+        print(f"FAIL: {result} ({elapsed:.1f}s)")
+        raise SystemExit(1)
@@ -0,0 +1,142 @@
+# history_store.py
+import mmap
+import os
+import struct
+import constants as const
+
+SPECIES_IDS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']
+NUM_SPECIES = len(SPECIES_IDS)
+
+# 파일 헤더: 매직, 레코드 크기, 종 수, 기록된 레코드 수
+HEADER_MAGIC = b"LKHIST01"
+HEADER_FORMAT = '<8sqqq'
+HEADER_SIZE = 64 # 레코드 정렬을 위해 여유를 둠
+# 레코드: 틱, 종별 개체 수, 종별 운, 에너지 풀
+RECORD_FORMAT = f'<q{NUM_SPECIES}q{NUM_SPECIES}dd'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+class _HistoryRecords:
+    """매핑된 레코드 영역(self._map, self.record_count)을 읽는 공통 기능"""
+    def tick_at(self, index):
+        return struct.unpack_from('<q', self._map, HEADER_SIZE + index * RECORD_SIZE)[0]
+
+    def read_range(self, start=0, stop=None, step=1):
+        """[start, stop) 레코드를 step 간격으로 읽어 {'tick': [...], 'A': [...], ..., 'luck': {...}, 'energy': [...]}로 반환합니다."""
+        stop = self.record_count if stop is None else min(stop, self.record_count)
+        start = max(0, start); step = max(1, int(step))
+        result = {'tick': [], 'energy': [], 'luck': {sid: [] for sid in SPECIES_IDS}}
+        for sid in SPECIES_IDS: result[sid] = []
+        for index in range(start, stop, step):
+            record = struct.unpack_from(RECORD_FORMAT, self._map, HEADER_SIZE + index * RECORD_SIZE)
+            result['tick'].append(record[0])
+            for i, sid in enumerate(SPECIES_IDS):
+                result[sid].append(record[1 + i])
+                result['luck'][sid].append(record[1 + NUM_SPECIES + i])
+            result['energy'].append(record[-1])
+        return result
+
+    def read_population_history(self, last_ticks=None, max_points=None):
+        """그래프용 종별 개체 수 이력. 최근 last_ticks개 레코드를 최대 max_points개로 솎아 읽습니다."""
+        start = 0 if last_ticks is None else max(0, self.record_count - last_ticks)
+        step = 1
+        if max_points and self.record_count - start > max_points:
+            step = -(-(self.record_count - start) // max_points) # 올림 나눗셈
+        data = self.read_range(start, self.record_count, step)
+        return {sid: data[sid] for sid in SPECIES_IDS}
+
+class HistorySnapshot(_HistoryRecords):
+    """저장소의 처음 record_count개 레코드에 대한 별도의 읽기 전용 매핑.
+
+    이미 기록된 레코드는 바뀌지 않으므로, 메인 스레드가 저장소에 계속 덧붙이는 동안
+    다른 스레드에서 읽어도 안전합니다.
+    """
+    def __init__(self, path, record_count):
+        self.record_count = record_count
+        with open(path, "rb") as history_file:
+            self._map = mmap.mmap(history_file.fileno(), HEADER_SIZE + record_count * RECORD_SIZE, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is None: return
+        self._map.close(); self._map = None
+
+class MappedHistoryStore(_HistoryRecords):
+    """틱별 개체 수/운/에너지를 메모리 맵 파일에 계속 덧붙이는 전체 이력 저장소.
+
+    RAM에는 매핑된 페이지만 올라오므로 실행 길이와 관계없이 메모리 사용량이 일정하고,
+    내보내기/그래프 확대는 필요한 구간만 파일에서 직접 읽습니다.
+    기록이 있는 파일은 resume_from_tick을 명시한 경우에만 열어 그 틱 이후 기록을 잘라내고 이어 쓰며,
+    그렇지 않으면 기존 이력을 덮어쓰지 않도록 FileExistsError를 냅니다.
+    """
+    def __init__(self, path, resume_from_tick=None):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not is_new and resume_from_tick is None:
+            raise FileExistsError(f"{path} already exists; pass resume_from_tick to continue it")
+        if not is_new and os.path.getsize(path) < HEADER_SIZE:
+            raise ValueError(f"{path} is not a compatible history store")
+        self._file = open(path, "w+b" if is_new else "r+b")
+        if is_new:
+            self.record_count = 0
+            self._resize(const.HISTORY_STORE_GROW_RECORDS)
+            self._write_header()
+        else:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            magic, record_size, num_species, self.record_count = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+            if magic != HEADER_MAGIC or record_size != RECORD_SIZE or num_species != NUM_SPECIES:
+                self._map.close(); self._file.close()
+                raise ValueError(f"{path} is not a compatible history store")
+            self.capacity = (len(self._map) - HEADER_SIZE) // RECORD_SIZE
+            self.truncate_after_tick(resume_from_tick)
+
+    def _write_header(self):
+        struct.pack_into(HEADER_FORMAT, self._map, 0, HEADER_MAGIC, RECORD_SIZE, NUM_SPECIES, self.record_count)
+
+    def _resize(self, capacity):
+        if getattr(self, "_map", None) is not None:
+            self._map.flush(); self._map.close()
+        self._file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.capacity = capacity
+
+    def last_tick(self):
+        """마지막으로 기록된 틱. 기록이 없으면 None."""
+        return self.tick_at(self.record_count - 1) if self.record_count else None
+
+    def append(self, tick, populations, species_luck, energy):
+        last_tick = self.last_tick()
+        if last_tick is not None and tick <= last_tick: # 틱 증가 순서는 truncate_after_tick의 이진 탐색이 전제로 함
+            raise ValueError(f"tick {tick} is not after the last stored tick {last_tick}")
+        if self.record_count >= self.capacity:
+            self._resize(self.capacity + const.HISTORY_STORE_GROW_RECORDS)
+        struct.pack_into(RECORD_FORMAT, self._map, HEADER_SIZE + self.record_count * RECORD_SIZE, tick,
+                         *(populations[sid] for sid in SPECIES_IDS),
+                         *(species_luck[sid] for sid in SPECIES_IDS), energy)
+        self.record_count += 1
+        self._write_header()
+
+    def truncate_after_tick(self, tick):
+        """tick보다 큰 틱의 기록을 버립니다. 틱은 증가 순으로 기록되어 있음."""
+        low, high = 0, self.record_count
+        while low < high: # tick 이하인 마지막 레코드 다음 위치를 이진 탐색
+            mid = (low + high) // 2
+            if self.tick_at(mid) <= tick: low = mid + 1
+            else: high = mid
+        self.record_count = low
+        self._write_header()
+
+    def snapshot(self):
+        """지금까지 기록된 레코드를 다른 스레드에서 읽을 수 있는 HistorySnapshot을 반환합니다."""
+        return HistorySnapshot(self.path, self.record_count)
+
+    def mapped_bytes(self):
+        return len(self._map)
+
+    def close(self):
+        if self._map is None: return
+        self._write_header()
+        self._map.flush(); self._map.close(); self._map = None
+        self._file.truncate(HEADER_SIZE + self.record_count * RECORD_SIZE) # 남은 예약 공간 반환
+        self._file.close()
@@ -0,0 +1,148 @@
+# luck_tuner.py
+# 운(Luck) 조절기 파라미터 자동 탐색 (successive halving)
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+import constants as const
+from simulation import Simulation
+
+# 탐색 공간: 이름 -> (최솟값, 최댓값, 정수 여부)
+SEARCH_SPACE = {
+    'LUCK_ADJUSTMENT_K_FACTOR': (0.1, 3.0, False),
+    'LUCK_ADJUSTMENT_PERIOD_TICKS': (1, 40, True),
+    'LUCK_MIN': (0.05, 0.9, False),
+    'LUCK_MAX': (1.1, 3.0, False),
+}
+
+def apply_constants_override(overrides):
+    """constants 모듈 값을 덮어씁니다. 시뮬레이션은 const.X를 매번 읽으므로 생성 전에 적용하면 됩니다."""
+    for name, value in overrides.items():
+        if not hasattr(const, name):
+            raise KeyError(f"Unknown constant in override: {name}")
+        setattr(const, name, value)
+
+def load_constants_override(path):
+    with open(path, "r", encoding="utf-8") as override_file:
+        overrides = json.load(override_file)
+    apply_constants_override(overrides)
+    return overrides
+
+def sample_config(rng):
+    config = {}
+    for name, (low, high, is_int) in SEARCH_SPACE.items():
+        config[name] = rng.randint(low, high) if is_int else round(rng.uniform(low, high), 3)
+    return config
+
+def evaluate_config(config, ticks, seed):
+    """헤드리스 실행 한 번의 목적 함수 값 (낮을수록 좋음)을 반환합니다.
+    목적 함수 = 평균 점유율 오차 + 멸종 벌점 (초기에 존재한 종 중 멸종한 비율)"""
+    if not pygame.font.get_init(): pygame.font.init()
+    apply_constants_override(config)
+    const.STATS_EXPORT_ON_EXIT = False # 튜너 실행은 통계 파일을 남기지 않음
+    random.seed(seed)
+
+    simulation = Simulation(headless=True)
+    target_shares = {sid: getattr(const, f"TARGET_RATIO_{sid}_SHARE") for sid in simulation.species_ids}
+    initially_present = {sid for sid in simulation.species_ids
+                         if getattr(simulation, f"creatures_{sid.lower()}")}
+    extinct = set()
+    share_error_sum = 0.0; share_error_samples = 0
+
+    for _ in range(ticks):
+        simulation._advance_tick()
+        populations = simulation._get_population_counts()
+        total = sum(populations.values())
+        if total == 0: break # 전멸: 남은 틱은 최대 오차로 간주
+        share_error_sum += sum(abs(populations[sid] / total - target_shares[sid]) for sid in simulation.species_ids)
+        share_error_samples += 1
+        extinct.update(sid for sid in initially_present if populations[sid] == 0)
+    simulation.close()
+
+    missing_ticks = ticks - share_error_samples
+    mean_share_error = (share_error_sum + 2.0 * missing_ticks) / ticks # 점유율 오차 합의 최댓값은 2
+    extinction_rate = len(extinct) / len(initially_present) if initially_present else 1.0
+    return mean_share_error + const.TUNER_EXTINCTION_PENALTY * extinction_rate
+
+def _evaluate_job(job):
+    config_index, config, ticks, seeds, defaults = job
+    apply_constants_override(defaults) # 재사용되는 작업자 프로세스에서 이전 설정 제거
+    scores = [evaluate_config(config, ticks, seed) for seed in seeds]
+    return config_index, sum(scores) / len(scores)
+
+class SuccessiveHalvingTuner:
+    """여러 설정을 짧게 실행해 상위 1/eta만 남기고, 남은 설정에 eta배 긴 실행을 배정합니다."""
+    def __init__(self, num_configs=None, min_ticks=None, max_ticks=None, eta=None, seeds=None, num_workers=None, rng_seed=0):
+        self.num_configs = num_configs or const.TUNER_NUM_CONFIGS
+        self.min_ticks = min_ticks or const.TUNER_MIN_TICKS
+        self.max_ticks = max_ticks or const.TUNER_MAX_TICKS
+        self.eta = eta or const.TUNER_ETA
+        self.seeds = seeds or list(range(const.TUNER_SEEDS_PER_CONFIG)) # 모든 설정에 같은 시드 사용
+        self.num_workers = num_workers
+        self.rng = random.Random(rng_seed)
+        self.results = {} # config_index -> (도달한 단계, 실행 틱 수, 점수)
+
+    def run(self):
+        configs = [sample_config(self.rng) for _ in range(self.num_configs)]
+        defaults = {name: getattr(const, name) for name in SEARCH_SPACE}
+        survivors = list(range(len(configs)))
+        ticks = self.min_ticks
+        rung = 0
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            while survivors:
+                jobs = [(i, configs[i], ticks, self.seeds, defaults) for i in survivors]
+                start = time.perf_counter()
+                scores = dict(executor.map(_evaluate_job, jobs))
+                for i, score in scores.items(): self.results[i] = (rung, ticks, score)
+                print(f"Tuner: rung {rung}, {len(survivors)} configs x {ticks} ticks "
+                      f"({time.perf_counter() - start:.1f}s), best {min(scores.values()):.4f}")
+
+                survivors.sort(key=lambda i: scores[i])
+                keep = max(1, math.ceil(len(survivors) / self.eta))
+                if len(survivors) == 1 or ticks * self.eta > self.max_ticks: break
+                survivors = survivors[:keep]
+                ticks *= self.eta
+                rung += 1
+        self.configs = configs
+        return self.ranked()
+
+    def ranked(self):
+        """높은 단계에 도달한 설정 우선, 같은 단계 안에서는 점수 순"""
+        order = sorted(self.results, key=lambda i: (-self.results[i][0], self.results[i][2]))
+        return [(self.configs[i], *self.results[i]) for i in order]
+
+def write_report(ranked, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    lines = ["rank  rung  ticks   score    " + "  ".join(SEARCH_SPACE)]
+    for rank, (config, rung, ticks, score) in enumerate(ranked, start=1):
+        values = "  ".join(f"{config[name]}" for name in SEARCH_SPACE)
+        lines.append(f"{rank:>4}  {rung:>4}  {ticks:>5}  {score:.4f}  {values}")
+    report = "\n".join(lines)
+    with open(os.path.join(output_dir, const.TUNER_REPORT_FILENAME), "w", encoding="utf-8") as report_file:
+        report_file.write(report + "\n")
+
+    override_path = os.path.join(output_dir, const.TUNER_OVERRIDE_FILENAME)
+    with open(override_path, "w", encoding="utf-8") as override_file:
+        json.dump(ranked[0][0], override_file, indent=2)
+    return report, override_path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Luck controller tuner (successive halving)")
+    parser.add_argument("--configs", type=int, default=None, help="초기 후보 설정 수")
+    parser.add_argument("--min-ticks", type=int, default=None, help="첫 단계 실행 틱 수")
+    parser.add_argument("--max-ticks", type=int, default=None, help="실행 틱 수 상한")
+    parser.add_argument("--eta", type=int, default=None, help="단계마다 남기는 비율의 역수")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 풀 크기")
+    parser.add_argument("--seed", type=int, default=0, help="후보 설정 샘플링 시드")
+    parser.add_argument("--output-dir", default=const.TUNER_OUTPUT_PATH)
+    args = parser.parse_args()
+
+    tuner = SuccessiveHalvingTuner(num_configs=args.configs, min_ticks=args.min_ticks, max_ticks=args.max_ticks,
+                                   eta=args.eta, num_workers=args.workers, rng_seed=args.seed)
+    report, override_path = write_report(tuner.run(), args.output_dir)
+    print(report)
+    print(f"Best configuration written to {override_path} (use: python main.py --constants-override {override_path})")
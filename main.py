@@ -1,12 +1,91 @@
 # main.py
+import argparse
+import os
 import pygame
+import constants as const
 from simulation import Simulation
+from capture import FrameCapture
+from luck_tuner import load_constants_override
+from scenario import load_scenario, apply_scenario_constants
+from shared_view import run_split
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ecosystem Simulation")
+    parser.add_argument("--headless", action="store_true", help="창 없이 실행")
+    parser.add_argument("--ticks", type=int, default=10000, help="헤드리스 모드에서 진행할 틱 수")
+    parser.add_argument("--split", action="store_true",
+                        help="시뮬레이션을 별도 프로세스에서 실행하고 공유 메모리로 읽는 뷰어만 표시")
+    parser.add_argument("--constants-override", default=None, help="constants 값을 덮어쓸 JSON 파일 (예: luck_tuner.py 결과)")
+    parser.add_argument("--scenario", default=None, help="초기 개체 수/분포/운/에너지 풀을 정의한 시나리오 JSON 파일")
+    parser.add_argument("--world-size", default=None, help="월드 크기 (예: 8000x6000), 기본값은 화면 크기")
+    parser.add_argument("--stepping", choices=["sequential", "redblack"], default=None,
+                        help="영양 단계 진행 방식 (redblack: 병렬 2단계 스케줄)")
+    parser.add_argument("--super-a", type=int, nargs="?", const=const.SUPER_INDIVIDUAL_A_MAX_AGENTS, default=None,
+                        metavar="MAX_AGENTS", help="A 슈퍼 개체 모드 (에이전트 하나가 여러 개체를 대표, 에이전트 수 예산)")
+    parser.add_argument("--no-pool", action="store_true", help="개체 풀 재사용 끄기")
+    parser.add_argument("--history-file", default=None, help="전체 이력을 기록할 메모리 맵 파일 경로")
+    parser.add_argument("--resume-history", type=int, default=None, metavar="TICK",
+                        help="기존 --history-file을 TICK 이후로 잘라내고 그 틱부터 이어 기록 (틱/운/그래프 이력 복원)")
+    parser.add_argument("--no-export-stats", action="store_true", help="종료 시 실행 통계 요약 JSON을 저장하지 않음")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="시작 시 tracemalloc 추적 시작 (M 키 보고서에 초기 할당 포함)")
+    parser.add_argument("--memory-report", type=int, default=0, metavar="TICKS",
+                        help="헤드리스 모드에서 지정한 틱 간격마다 메모리 보고서 출력")
+    parser.add_argument("--capture", choices=["png", "raw"], help="프레임 캡처 (PNG 시퀀스 또는 raw RGB 스트림)")
+    parser.add_argument("--capture-dir", default=None, help="캡처 출력 디렉터리")
+    parser.add_argument("--capture-size", default=None, help="캡처 해상도 (예: 1280x720)")
+    parser.add_argument("--ticks-per-frame", type=int, default=None, help="캡처 프레임당 진행할 틱 수")
+    args = parser.parse_args()
+    if args.resume_history is not None and not args.history_file:
+        parser.error("--resume-history requires --history-file")
+    if args.split: # 분리 모드의 시뮬레이션 프로세스는 창/캡처/이력 파일/메모리 보고를 지원하지 않음
+        unsupported = [flag for flag, value in (("--headless", args.headless), ("--history-file", args.history_file),
+                                                ("--capture", args.capture), ("--memory-report", args.memory_report),
+                                                ("--trace-memory", args.trace_memory)) if value]
+        if unsupported: parser.error(f"--split cannot be combined with {', '.join(unsupported)}")
+    return args
 
 if __name__ == '__main__':
+    args = parse_args()
+    if args.headless: os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
     pygame.init()
     pygame.font.init()
+
+    constants_override = load_constants_override(args.constants_override) if args.constants_override else {}
+    scenario = load_scenario(args.scenario) if args.scenario else None
+    if scenario is not None: apply_scenario_constants(scenario) # --world-size가 주어지면 그 값이 우선
+    if args.world_size:
+        const.WORLD_WIDTH, const.WORLD_HEIGHT = (int(v) for v in args.world_size.lower().split("x"))
+    if args.world_size or scenario is not None: # 분리 모드의 시뮬레이션 프로세스에도 같은 월드 크기 전달
+        constants_override.update(WORLD_WIDTH=const.WORLD_WIDTH, WORLD_HEIGHT=const.WORLD_HEIGHT)
+    if args.no_export_stats: const.STATS_EXPORT_ON_EXIT = False
+    if args.super_a:
+        const.SUPER_INDIVIDUAL_A_MAX_AGENTS = args.super_a
+        constants_override.update(SUPER_INDIVIDUAL_A_MAX_AGENTS=args.super_a)
+
+    simulation_kwargs = {"stepping_mode": args.stepping, "use_creature_pool": False if args.no_pool else None,
+                         "use_super_individuals": True if args.super_a else None, "scenario": scenario,
+                         "memory_report": True if (args.trace_memory or args.memory_report > 0) else None}
+    if args.split: # 시뮬레이션 프로세스 + 뷰어 (현재 프로세스)
+        run_split(constants_override=constants_override, simulation_kwargs=simulation_kwargs,
+                  export_statistics=const.STATS_EXPORT_ON_EXIT)
+    else:
+        simulation_instance = Simulation(headless=args.headless, **simulation_kwargs)
+        if args.history_file:
+            try: simulation_instance.open_history_store(args.history_file, resume_from_tick=args.resume_history)
+            except FileExistsError as error:
+                simulation_instance.close(); pygame.quit()
+                raise SystemExit(f"{error}. 기존 이력을 지키기 위해 중단합니다 (다른 경로를 지정하거나 --resume-history TICK으로 이어 쓰세요).")
+        if args.capture:
+            capture_size = tuple(int(v) for v in args.capture_size.lower().split("x")) if args.capture_size else None
+            capture_dir = args.capture_dir or const.CAPTURE_SAVE_PATH
+            simulation_instance.enable_frame_capture(FrameCapture(capture_dir, mode=args.capture, size=capture_size),
+                                                     ticks_per_frame=args.ticks_per_frame)
+
+        if args.headless:
+            simulation_instance.run_headless(args.ticks, memory_report_interval=args.memory_report)
+        else:
+            simulation_instance.run()
     
-    simulation_instance = Simulation()
-    simulation_instance.run()
-    
-    pygame.quit()
\ No newline at end of file
+    pygame.quit()
@@ -0,0 +1,100 @@
+# memory_report.py
+import sys
+import tracemalloc
+import constants as const
+
+# 개체 간에 공유되는 값 (색상 튜플, 종 이름 문자열 등)은 개체별 크기에서 제외
+_SHARED_VALUE_TYPES = (str, tuple, bool, type(None))
+
+def estimate_creature_bytes(creature):
+    """개체 하나가 차지하는 대략적인 바이트 수 (인스턴스 + __dict__ + 개별 속성 값)"""
+    total = sys.getsizeof(creature) + sys.getsizeof(creature.__dict__)
+    for value in creature.__dict__.values():
+        if isinstance(value, _SHARED_VALUE_TYPES): continue
+        total += sys.getsizeof(value)
+        if hasattr(value, "int"): total += sys.getsizeof(value.int) # uuid.UUID 내부 정수
+    return total
+
+def estimate_list_bytes(values):
+    """리스트 자체와 원소 크기의 합 (작은 정수 캐시는 무시하고 근사)"""
+    return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+def _format_bytes(num_bytes):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(num_bytes) < 1024: return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GiB"
+
+class MemoryReporter:
+    """종별/하위 시스템별 메모리 사용량 보고서. tracemalloc 스냅샷을 이전 보고서와 비교해 증가분을 보여줍니다."""
+    def __init__(self, top_n=None):
+        self.top_n = top_n or const.MEMORY_REPORT_TOP_N
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(const.MEMORY_TRACE_FRAMES)
+        self.previous_snapshot = None
+        self.previous_tick = None
+
+    def _take_snapshot(self):
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def build_report(self, simulation):
+        lines = [f"=== Memory Report (Tick {simulation.current_tick}) ==="]
+
+        lines.append("[Species]")
+        species_total = 0
+        for sid in simulation.species_ids:
+            creature_list = getattr(simulation, f"creatures_{sid.lower()}")
+            per_creature = estimate_creature_bytes(creature_list[0]) if creature_list else 0
+            list_bytes = sys.getsizeof(creature_list) + per_creature * len(creature_list)
+            species_total += list_bytes
+            lines.append(f"  {sid}: {len(creature_list)} x {per_creature} B = {_format_bytes(list_bytes)}")
+        lines.append(f"  Total: {_format_bytes(species_total)}")
+
+        history_bytes = {sid: estimate_list_bytes(h) for sid, h in simulation.population_history.items()}
+        lines.append(f"[History] {_format_bytes(sum(history_bytes.values()))} "
+                     f"({max((len(h) for h in simulation.population_history.values()), default=0)} samples/species)")
+
+        if simulation.history_store:
+            store = simulation.history_store
+            lines.append(f"[History store] {store.record_count} records, mapped {_format_bytes(store.mapped_bytes())} "
+                         f"({store.path})")
+
+        lines.append("[Surfaces]")
+        for name, surface in simulation._get_cached_surfaces().items():
+            lines.append(f"  {name}: {surface.get_width()}x{surface.get_height()} = {_format_bytes(surface_bytes(surface))}")
+
+        if simulation.creature_pool:
+            pool = simulation.creature_pool
+            pooled_bytes = sum(sys.getsizeof(free_list) + len(free_list) * estimate_creature_bytes(free_list[0])
+                               for free_list in pool.free_lists.values() if free_list)
+            lines.append(f"[Creature pool] {pool.free_count()} free creatures = {_format_bytes(pooled_bytes)} "
+                         f"(hit rate {pool.hit_rate() * 100:.1f}%)")
+
+        # 신생 개체는 틱 중간에 임시 리스트에 모였다가 종 리스트로 옮겨지므로, 한 틱의 최대치를 보고
+        peak_newborns = {sid: n for sid, n in simulation.peak_newborns_per_tick.items() if n}
+        peak_text = ", ".join(f"{sid} {n}" for sid, n in peak_newborns.items()) or "none"
+        lines.append(f"[Newborns] peak per tick: {peak_text}")
+
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(f"[tracemalloc] current {_format_bytes(current)}, peak {_format_bytes(peak)}")
+
+        snapshot = self._take_snapshot()
+        if self.previous_snapshot is not None:
+            lines.append(f"[Growth since tick {self.previous_tick}]")
+            for stat in snapshot.compare_to(self.previous_snapshot, "lineno")[:self.top_n]:
+                lines.append(f"  {stat}")
+        self.previous_snapshot = snapshot
+        self.previous_tick = simulation.current_tick
+        return "\n".join(lines)
+
+    def print_report(self, simulation):
+        print(self.build_report(simulation))
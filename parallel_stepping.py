@@ -0,0 +1,108 @@
+# parallel_stepping.py
+from concurrent.futures import ThreadPoolExecutor
+import constants as const
+
+try:
+    import numpy as np
+except ImportError: # numpy가 없으면 개체별 find_target으로 대체 (결과는 같고 속도만 다름)
+    np = None
+
+# 레드/블랙 스케줄: (포식자, 먹이) 쌍. 같은 단계 안의 쌍들은 서로 다른 리스트만 건드림
+RED_LEVELS = (('B', 'A'), ('D', 'C'), ('F', 'E'), ('H', 'G'))
+BLACK_LEVELS = (('C', 'B'), ('E', 'D'), ('G', 'F'), ('I', 'H'))
+
+class ArrayTargetFinder:
+    """먹이/포식자 위치를 배열로 스냅샷해 포식자별 최근접 먹이를 벡터 연산으로 찾습니다.
+
+    먹이를 사냥 반경 크기의 격자 셀 순서로 정렬해 두고, 포식자마다 주변 3x3 셀의 먹이만 후보로 거리를 계산하므로
+    메모리는 먹이/포식자 수에 비례합니다 (포식자 x 먹이 거리 행렬을 만들지 않음).
+    find_target과 같은 규칙(사냥 반경 미만, 가장 가까운 먹이, 동거리면 리스트 앞쪽)을 따르며,
+    살아있는지 여부는 호출 시점에 확인하므로 같은 단계에서 먼저 잡아먹힌 먹이는 건너뜁니다.
+    numpy 연산 중에는 GIL이 해제되어 다른 단계의 스레드가 함께 진행될 수 있습니다.
+    """
+    def __init__(self, predators, prey, hunt_radius):
+        self.prey = prey
+        self.radius_sq = hunt_radius ** 2
+        self.prey_x = np.fromiter((p.x for p in prey), dtype=np.float64, count=len(prey))
+        self.prey_y = np.fromiter((p.y for p in prey), dtype=np.float64, count=len(prey))
+        # 포식자 위치는 자신의 차례 전까지 바뀌지 않으므로 시작 시점 값을 사용
+        self.predator_x = np.fromiter((p.x for p in predators), dtype=np.float64, count=len(predators))
+        self.predator_y = np.fromiter((p.y for p in predators), dtype=np.float64, count=len(predators))
+
+        # 셀 키 = cx * stride + (cy + 1). 먹이 인덱스를 셀 키 순으로 (셀 안에서는 리스트 순으로) 정렬
+        cell_size = float(hunt_radius)
+        prey_cx = np.floor(self.prey_x / cell_size).astype(np.int64)
+        prey_cy = np.floor(self.prey_y / cell_size).astype(np.int64)
+        predator_cx = np.floor(self.predator_x / cell_size).astype(np.int64)
+        predator_cy = np.floor(self.predator_y / cell_size).astype(np.int64)
+        min_cy = min(prey_cy.min(initial=0), predator_cy.min(initial=0))
+        stride = max(prey_cy.max(initial=0), predator_cy.max(initial=0)) - min_cy + 3
+        prey_keys = prey_cx * stride + (prey_cy - min_cy + 1)
+        self.prey_order = np.argsort(prey_keys, kind="stable")
+        sorted_keys = prey_keys[self.prey_order]
+        # 포식자별 주변 3x3 셀의 정렬된 먹이 구간 [start, end)
+        offsets = np.array([dx * stride + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+        neighbor_keys = (predator_cx * stride + (predator_cy - min_cy + 1))[:, None] + offsets
+        self.range_start = np.searchsorted(sorted_keys, neighbor_keys, side="left")
+        self.range_end = np.searchsorted(sorted_keys, neighbor_keys, side="right")
+
+    def __call__(self, predator_index):
+        if not self.prey: return None
+        starts = self.range_start[predator_index]; ends = self.range_end[predator_index]
+        slices = [self.prey_order[start:end] for start, end in zip(starts, ends) if end > start]
+        if not slices: return None
+        candidates = np.concatenate(slices)
+        distances = ((self.predator_x[predator_index] - self.prey_x[candidates]) ** 2
+                     + (self.predator_y[predator_index] - self.prey_y[candidates]) ** 2)
+        in_range = distances < self.radius_sq
+        candidates = candidates[in_range]; distances = distances[in_range]
+        for prey_index in candidates[np.lexsort((candidates, distances))]: # 거리 순, 동거리면 리스트 앞쪽
+            target = self.prey[prey_index]
+            if target.is_alive: return target
+        return None
+
+class ParallelStepper:
+    """영양 단계 행동을 레드/블랙 2단계 스케줄로 병렬 실행합니다 (스레드 풀).
+
+    1단계(레드): B, D, F, H가 동시에 행동 (각각 A, C, E, G를 사냥)
+    2단계(블랙): C, E, G, I가 동시에 행동 (각각 B, D, F, H를 사냥)
+
+    순차 경로(B→C→...→I)와의 의미 차이:
+    - D, F, H는 먹이(C, E, G)가 이번 틱에 행동하기 전 상태를 봅니다. 이번 틱에 태어난 C, E, G는 사냥 대상이 아닙니다.
+    - 1단계에서 잡아먹힌 C, E, G는 2단계에서 행동하지 않습니다 (순차 경로에서는 먼저 행동한 뒤 잡아먹힘).
+    - C, E, G, I는 순차 경로와 같이 먹이가 행동을 마친 후의 상태를 봅니다.
+    - 전역 random 모듈을 여러 스레드가 공유하므로 같은 시드라도 실행마다 난수 소비 순서가 달라질 수 있습니다.
+    같은 단계 안에서의 행동 순서와 사냥 규칙은 순차 경로와 동일합니다.
+
+    개체가 파이썬 객체이므로 프로세스 풀 대신 스레드 풀을 사용하며,
+    최근접 먹이 탐색은 numpy 배열 연산(ArrayTargetFinder)으로 수행해 GIL 경합을 줄입니다.
+    """
+    def __init__(self, num_workers=None):
+        self.num_workers = num_workers or const.PARALLEL_STEPPING_WORKERS
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="trophic")
+        return self._executor
+
+    def _step_level(self, simulation, predator_id, prey_id):
+        predators = getattr(simulation, f"creatures_{predator_id.lower()}")
+        prey = getattr(simulation, f"creatures_{prey_id.lower()}")
+        target_finder = None
+        if np is not None and predators and prey:
+            target_finder = ArrayTargetFinder(predators, prey, getattr(const, f"CREATURE_{predator_id}_HUNT_RADIUS"))
+        simulation._update_species_actions(predators, prey, predator_id, target_finder=target_finder)
+
+    def step(self, simulation):
+        executor = self._get_executor()
+        for phase in (RED_LEVELS, BLACK_LEVELS):
+            futures = [executor.submit(self._step_level, simulation, predator_id, prey_id)
+                       for predator_id, prey_id in phase
+                       if getattr(simulation, f"creatures_{predator_id.lower()}")]
+            for future in futures: future.result() # 단계 경계에서 동기화 (예외 전파)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,295 @@
+# population_graph.py
+# 개체 수 그래프 그리기와 전체 이력 그래프의 백그라운드 저장
+import os
+import queue
+import threading
+import time
+import pygame
+import constants as const
+
+SPECIES_IDS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']
+
+def draw_population_graph(surface_to_draw_on, graph_rect, current_history_source, font, graph_mode='all',
+                          full_history_mode=False, current_tick=0):
+    """종별 개체 수 이력을 graph_rect 영역에 그립니다. full_history_mode는 저장용 (모든 종, 전체 이력, 오른쪽 범례)."""
+    pygame.draw.rect(surface_to_draw_on, const.GRAPH_BG_COLOR, graph_rect)
+    pygame.draw.rect(surface_to_draw_on, const.GRAPH_AXIS_COLOR, graph_rect, 1)
+
+    species_map = {
+        'A': (const.GRAPH_LINE_COLOR_A, current_history_source.get('A', [])),
+        'B': (const.GRAPH_LINE_COLOR_B, current_history_source.get('B', [])),
+        'C': (const.GRAPH_LINE_COLOR_C, current_history_source.get('C', [])),
+        'D': (const.GRAPH_LINE_COLOR_D, current_history_source.get('D', [])),
+        'E': (const.GRAPH_LINE_COLOR_E, current_history_source.get('E', [])),
+        'F': (const.GRAPH_LINE_COLOR_F, current_history_source.get('F', [])),
+        'G': (const.GRAPH_LINE_COLOR_G, current_history_source.get('G', [])),
+        'H': (const.GRAPH_LINE_COLOR_H, current_history_source.get('H', [])),
+        'I': (const.GRAPH_LINE_COLOR_I, current_history_source.get('I', []))
+    }
+
+    active_keys_to_draw = []
+    if graph_mode == 'all' or full_history_mode:
+        active_keys_to_draw = SPECIES_IDS # 모든 종을 그림
+    elif graph_mode in ['A', 'B', 'C']: # 개별 모드는 A, B, C만 지원
+        active_keys_to_draw = [graph_mode]
+    else: # 그 외의 경우 (예: graph_mode가 D, E.. 로 설정될 수 있는 키가 없다면)
+         active_keys_to_draw = [] # 또는 'all'로 기본 설정
+
+    has_data_to_draw = False
+    for key in active_keys_to_draw:
+        if key in species_map and species_map[key][1]:
+            has_data_to_draw = True; break
+    if not has_data_to_draw: return
+
+    max_pop_overall = 1; max_history_len_for_scale = 0
+    for key in active_keys_to_draw:
+        if key not in species_map: continue
+        history = species_map[key][1]
+        if history:
+            max_pop_overall = max(max_pop_overall, max(history))
+            max_history_len_for_scale = max(max_history_len_for_scale, len(history))
+
+    if max_history_len_for_scale < (1 if full_history_mode and max_history_len_for_scale == 1 else 2) : return
+
+    y_axis_label_space = const.GRAPH_PADDING*2 + font.get_height()
+    x_axis_label_space = const.GRAPH_PADDING*2 + font.get_height()
+    title_space = const.GRAPH_PADDING + font.get_height() + 5
+    legend_space_per_item = font.get_height() + 2
+    max_pop_text_height = font.get_height() + 5
+
+
+    inner_graph_x = graph_rect.left + y_axis_label_space
+    inner_graph_y = graph_rect.top + title_space + max_pop_text_height # 제목 및 Max Pop 위한 공간
+
+    # 범례가 너무 길어지면 그래프 영역 침범 가능, 저장 시에는 범례 위치 조정 또는 별도 영역 필요
+    available_legend_height = graph_rect.height - (title_space + max_pop_text_height + x_axis_label_space + const.GRAPH_PADDING)
+    num_legend_items_can_fit = available_legend_height // legend_space_per_item
+
+    inner_graph_width = graph_rect.width - y_axis_label_space - const.GRAPH_PADDING
+    # 범례 공간을 위해 그래프 높이 조정 (화면 표시 시)
+    if not full_history_mode and (graph_mode == 'all' or len(active_keys_to_draw) > 1) :
+         # 화면 표시용 'all' 모드일 때만 범례 공간 확보
+         legend_total_height = len(active_keys_to_draw) * legend_space_per_item
+         inner_graph_height = graph_rect.height - title_space - max_pop_text_height - x_axis_label_space - const.GRAPH_PADDING - legend_total_height
+    else:
+         inner_graph_height = graph_rect.height - title_space - max_pop_text_height - x_axis_label_space - const.GRAPH_PADDING
+
+
+
+    if inner_graph_width <=10 or inner_graph_height <=10: return
+
+    pygame.draw.line(surface_to_draw_on, const.GRAPH_AXIS_COLOR, (inner_graph_x, inner_graph_y + inner_graph_height), (inner_graph_x + inner_graph_width, inner_graph_y + inner_graph_height), 1)
+    pygame.draw.line(surface_to_draw_on, const.GRAPH_AXIS_COLOR, (inner_graph_x, inner_graph_y), (inner_graph_x, inner_graph_y + inner_graph_height), 1)
+
+    for key in active_keys_to_draw:
+        if key not in species_map: continue
+        line_color, history = species_map[key]
+        data_to_plot = history
+        if not full_history_mode and const.GRAPH_MAX_HISTORY > 0 and len(history) > const.GRAPH_MAX_HISTORY:
+            data_to_plot = history[-const.GRAPH_MAX_HISTORY:]
+        num_points_to_draw = len(data_to_plot)
+        if num_points_to_draw < (1 if full_history_mode and num_points_to_draw == 1 else 2): continue
+        point_spacing_x = inner_graph_width/(num_points_to_draw-1) if num_points_to_draw > 1 else 0
+        points = []
+        for i, pop_count in enumerate(data_to_plot):
+            x = inner_graph_x + (i * point_spacing_x if num_points_to_draw > 1 else 0)
+            y_val_norm = pop_count / max_pop_overall if max_pop_overall > 0 else 0
+            y = inner_graph_y + inner_graph_height * (1 - y_val_norm)
+            points.append((x, y))
+        if len(points) >= 2: pygame.draw.lines(surface_to_draw_on, line_color, False, points, const.GRAPH_LINE_THICKNESS)
+        elif len(points) == 1: pygame.draw.circle(surface_to_draw_on, line_color, points[0], const.GRAPH_LINE_THICKNESS +1)
+
+    font_to_use = font
+    graph_mode_display = graph_mode
+    if full_history_mode: graph_mode_display = 'ALL (Saved)'
+    elif graph_mode not in ['A', 'B', 'C']: graph_mode_display = 'ALL'
+
+    title_text_content = f"Mode: {graph_mode_display.upper()}"
+    if full_history_mode: title_text_content = f"Full History (Tick: {current_tick})"
+    title_surf = font_to_use.render(title_text_content, True, const.GRAPH_TEXT_COLOR)
+    surface_to_draw_on.blit(title_surf, (graph_rect.centerx - title_surf.get_width() // 2, graph_rect.top + 5))
+
+    max_pop_text = f"Max: {max_pop_overall}"
+    max_pop_surf = font_to_use.render(max_pop_text, True, const.GRAPH_TEXT_COLOR)
+    surface_to_draw_on.blit(max_pop_surf, (inner_graph_x + 5, graph_rect.top + 5 + title_surf.get_height()))
+
+    x_label_text = "Time (Ticks)"
+    x_label_surf = font_to_use.render(x_label_text, True, const.GRAPH_TEXT_COLOR)
+    surface_to_draw_on.blit(x_label_surf, (graph_rect.centerx - x_label_surf.get_width() // 2, graph_rect.bottom - const.GRAPH_PADDING - x_label_surf.get_height() + 5 ))
+
+    y_label_text = "Population"
+    y_label_surf = font_to_use.render(y_label_text, True, const.GRAPH_TEXT_COLOR)
+    y_label_surf_rotated = pygame.transform.rotate(y_label_surf, 90)
+    surface_to_draw_on.blit(y_label_surf_rotated, (graph_rect.left + 5, graph_rect.centery - y_label_surf_rotated.get_height() // 2))
+
+    # 범례 (화면 표시 시, 공간이 협소하면 일부만 표시하거나 다르게 배치)
+    if not full_history_mode and (graph_mode == 'all' or len(active_keys_to_draw) > 1):
+        legend_y_start = graph_rect.bottom - const.GRAPH_PADDING - x_axis_label_space - const.GRAPH_PADDING  # X축 위, 패딩 고려
+        max_legend_items_fit_on_screen = 4 # 예시, 화면 공간에 따라 조절
+
+        items_drawn = 0
+        for key in active_keys_to_draw: # 모든 활성 키에 대해 시도
+            if items_drawn >= max_legend_items_fit_on_screen and len(active_keys_to_draw) > max_legend_items_fit_on_screen:
+                # "et al." 또는 "..." 같은 표시 추가 가능
+                etc_surf = font_to_use.render("...", True, const.GRAPH_TEXT_COLOR)
+                surface_to_draw_on.blit(etc_surf, (inner_graph_x + 5, legend_y_start - (items_drawn * legend_space_per_item) ))
+                break
+
+            if key in species_map:
+                color, _ = species_map[key]
+                legend_text = f"{key}"
+                legend_surf = font_to_use.render(legend_text, True, color)
+                current_legend_y = legend_y_start - (items_drawn * legend_space_per_item) - legend_surf.get_height()
+                if current_legend_y < inner_graph_y : continue # 그래프 영역 침범 방지
+
+                surface_to_draw_on.blit(legend_surf, (inner_graph_x + 5, current_legend_y))
+                pygame.draw.line(surface_to_draw_on, color, 
+                                 (inner_graph_x + legend_surf.get_width() + 10, current_legend_y + legend_surf.get_height()//2), 
+                                 (inner_graph_x + legend_surf.get_width() + 30, current_legend_y + legend_surf.get_height()//2), 2)
+                items_drawn += 1
+    elif full_history_mode : # 저장시 범례
+        legend_y_start = graph_rect.top + title_space + max_pop_text_height + const.GRAPH_PADDING
+        legend_x_start = inner_graph_x + inner_graph_width + const.GRAPH_PADDING # 그래프 오른쪽에 범례 표시 (공간이 있다면)
+        if legend_x_start + 100 > graph_rect.right : # 공간 부족 시 그래프 아래쪽
+             legend_x_start = inner_graph_x
+             legend_y_start = inner_graph_y + inner_graph_height + const.GRAPH_PADDING + 5
+
+        for key in SPECIES_IDS: # 저장 시 모든 종 범례
+            if key in species_map:
+                color, _ = species_map[key]
+                legend_text = f"{key}"
+                legend_surf = font_to_use.render(legend_text, True, color)
+                if legend_y_start + legend_surf.get_height() > graph_rect.bottom - const.GRAPH_PADDING: # 범례가 영역을 벗어나면 중단
+                    break 
+                surface_to_draw_on.blit(legend_surf, (legend_x_start, legend_y_start))
+                pygame.draw.line(surface_to_draw_on, color, 
+                                 (legend_x_start + legend_surf.get_width() + 5, legend_y_start + legend_surf.get_height()//2), 
+                                 (legend_x_start + legend_surf.get_width() + 25, legend_y_start + legend_surf.get_height()//2), 2)
+                legend_y_start += legend_surf.get_height() + 2
+
+class PrerenderedFont:
+    """메인 스레드에서 미리 렌더링한 표면으로 font.render/get_height를 대신합니다.
+
+    SDL_ttf는 스레드 안전하지 않으므로 워커 스레드의 draw_population_graph에는 실제 폰트 대신 이것을 넘깁니다.
+    미리 렌더링한 (문자열, 색) 조합은 그대로 돌려주고, 그 외의 문자열은 글자 표면을 이어 붙여 만듭니다.
+    """
+    def __init__(self, font, texts, glyph_chars):
+        self._height = font.get_height()
+        self._texts = {(text, tuple(color)): font.render(text, True, color) for text, color in texts}
+        self._glyphs = {char: font.render(char, True, const.GRAPH_TEXT_COLOR) for char in set(glyph_chars)}
+
+    def get_height(self):
+        return self._height
+
+    def render(self, text, antialias, color):
+        surface = self._texts.get((text, tuple(color)))
+        if surface is not None: return surface
+        glyphs = [self._glyphs[char] for char in text if char in self._glyphs] # 글자 표면은 GRAPH_TEXT_COLOR 전용
+        surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self._height), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surface
+
+def prerender_full_history_text(font, current_tick):
+    """전체 이력 그래프(full_history_mode)에 쓰이는 문자열을 메인 스레드에서 렌더링합니다."""
+    texts = [(f"Full History (Tick: {current_tick})", const.GRAPH_TEXT_COLOR),
+             ("Time (Ticks)", const.GRAPH_TEXT_COLOR), ("Population", const.GRAPH_TEXT_COLOR)]
+    texts += [(sid, getattr(const, f"GRAPH_LINE_COLOR_{sid}")) for sid in SPECIES_IDS]
+    return PrerenderedFont(font, texts, "Max: 0123456789") # 최대 개체 수는 워커에서 이력을 읽은 뒤에야 알 수 있음
+
+class GraphSaver:
+    """전체 이력 그래프를 워커 스레드에서 그리고 PNG로 인코딩합니다.
+
+    메인 루프는 이력 스냅샷(메모리 이력 복사본 또는 이력 저장소의 읽기 전용 매핑)과 미리 렌더링한 글자만 만들어
+    큐에 넣으므로 저장 중에도 틱과 화면 갱신이 멈추지 않습니다. 워커는 폰트(SDL_ttf)를 직접 쓰지 않습니다.
+    여러 저장 요청은 순서대로 처리됩니다.
+    """
+    def __init__(self):
+        self.job_queue = queue.Queue()
+        self.pending_jobs = 0 # 대기 중 + 처리 중
+        self.current_stage = None # 처리 중인 작업 단계 ('reading', 'drawing', 'encoding')
+        self.last_message = None
+        self.last_message_time = 0.0
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._worker_loop, name="graph-saver", daemon=True)
+        self._worker.start()
+
+    def submit(self, history_source, current_tick, font):
+        """history_source는 {종: [개체 수, ...]} 또는 read_population_history()를 가진 이력 스냅샷.
+        font는 메인 스레드의 그래프 폰트이며, 여기(메인 스레드)에서만 사용합니다."""
+        text_font = prerender_full_history_text(font, current_tick)
+        with self._lock: self.pending_jobs += 1
+        self.job_queue.put((history_source, current_tick, text_font, time.strftime("%Y%m%d-%H%M%S")))
+
+    def status_line(self):
+        """HUD 표시용 진행/완료 상태. 표시할 내용이 없으면 None."""
+        with self._lock:
+            if self.pending_jobs:
+                queued = f" (+{self.pending_jobs - 1} queued)" if self.pending_jobs > 1 else ""
+                return f"Saving graph: {self.current_stage or 'queued'}{queued}"
+            if self.last_message and time.time() - self.last_message_time < const.GRAPH_SAVE_STATUS_SECONDS:
+                return self.last_message
+        return None
+
+    def _set_stage(self, stage):
+        with self._lock: self.current_stage = stage
+
+    def _finish(self, message):
+        print(message)
+        with self._lock:
+            self.pending_jobs -= 1
+            self.current_stage = None
+            self.last_message = message
+            self.last_message_time = time.time()
+
+    def _worker_loop(self):
+        while True:
+            job = self.job_queue.get()
+            if job is None: break
+            history_source, current_tick, text_font, timestamp = job
+            # 어떤 예외든 작업을 끝난 것으로 처리해야 대기 수가 줄고 다음 저장이 진행됨 (워커가 죽지 않도록)
+            try: self._finish(self._save(history_source, current_tick, text_font, timestamp))
+            except Exception as e: self._finish(f"Graph save failed: {type(e).__name__}: {e}")
+
+    def _save(self, history_source, current_tick, text_font, timestamp):
+        try: return self._draw_and_encode(history_source, current_tick, text_font, timestamp)
+        finally: # 이력 스냅샷의 읽기 전용 매핑은 성공/실패와 관계없이 닫음
+            if hasattr(history_source, "close"): history_source.close()
+
+    def _draw_and_encode(self, history_source, current_tick, text_font, timestamp):
+        self._set_stage('reading')
+        if hasattr(history_source, "read_population_history"):
+            history_to_save = history_source.read_population_history(max_points=const.HISTORY_EXPORT_MAX_POINTS)
+        else:
+            history_to_save = history_source
+
+        max_ticks_recorded = max((len(history_list) for history_list in history_to_save.values()), default=0)
+        if max_ticks_recorded == 0: return "Graph Save: History is empty."
+
+        self._set_stage('drawing')
+        save_width = const.GRAPH_SAVE_DEFAULT_WIDTH
+        if const.GRAPH_SAVE_X_PIXELS_PER_TICK > 0:
+            potential_width = max_ticks_recorded * const.GRAPH_SAVE_X_PIXELS_PER_TICK + const.GRAPH_PADDING * 10 # 넓은 패딩
+            save_width = max(potential_width, const.GRAPH_SAVE_DEFAULT_WIDTH)
+        save_surface = pygame.Surface((save_width, const.GRAPH_SAVE_DEFAULT_HEIGHT))
+        save_surface.fill(const.GRAPH_BG_COLOR)
+        draw_population_graph(save_surface, save_surface.get_rect(), history_to_save, text_font,
+                              full_history_mode=True, current_tick=current_tick)
+
+        self._set_stage('encoding')
+        os.makedirs(const.GRAPH_SAVE_PATH, exist_ok=True)
+        full_path = os.path.join(const.GRAPH_SAVE_PATH, f"{const.GRAPH_FILENAME_PREFIX}{current_tick}_{timestamp}.png")
+        suffix = 1
+        while os.path.exists(full_path): # 같은 틱/시각에 여러 번 저장한 경우
+            full_path = os.path.join(const.GRAPH_SAVE_PATH,
+                                     f"{const.GRAPH_FILENAME_PREFIX}{current_tick}_{timestamp}_{suffix}.png")
+            suffix += 1
+        pygame.image.save(save_surface, full_path)
+        return f"Graph saved to {full_path}"
+
+    def close(self):
+        """대기 중인 저장을 모두 마치고 워커를 종료합니다."""
+        self.job_queue.put(None)
+        self._worker.join()
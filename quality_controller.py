@@ -0,0 +1,91 @@
+# quality_controller.py
+from collections import namedtuple
+import constants as const
+
+# 품질 단계별 설정. 단계가 높을수록 렌더링을 덜 하고 프레임당 더 많은 틱을 진행
+QualityLevel = namedtuple("QualityLevel", [
+    "graph_refresh_frames", # 그래프 패널을 다시 그리는 간격 (그 사이에는 캐시를 그대로 표시)
+    "hud_refresh_frames", # HUD 문자열을 다시 렌더링하는 간격
+    "creature_sample_stride", # 종별로 N마리 중 한 마리만 그림
+    "max_ticks_per_frame", # 밀린 틱을 한 프레임에 최대 몇 틱까지 따라잡을지
+])
+
+class QualityController:
+    """프레임별 틱/렌더링 시간을 재서 목표 프레임 시간을 지키도록 품질 단계를 조절합니다.
+
+    작업 시간(틱 + 렌더링, clock.tick 대기 제외)의 지수 이동 평균이 목표의 QUALITY_DOWNGRADE_MARGIN배를 넘으면 품질을 낮춥니다.
+    높이는 판단에는 밀린 틱을 따라잡느라 쓴 시간을 쓰지 않고 (높은 단계일수록 프레임당 틱을 더 허용하므로 갇힘),
+    한 단계 위의 예상 프레임 시간 = 그 단계의 렌더링 시간 추정치 + 틱당 시간 x 그 단계의 프레임당 최대 틱 수가
+    목표의 QUALITY_UPGRADE_MARGIN배 아래일 때 높입니다. 떠난 단계의 렌더링 시간 추정치는 QUALITY_RENDER_ESTIMATE_DECAY_MS에 걸쳐
+    현재 측정값으로 수렴하므로, 일시적인 급증으로 내려간 경우에도 다시 올라갈 수 있습니다.
+    단계를 바꾼 뒤 측정된 작업 시간이 QUALITY_ADJUST_COOLDOWN_MS만큼 쌓이기 전에는 다시 바꾸지 않습니다.
+    끄면(enabled=False) 최고 품질(0단계)로 고정됩니다.
+    """
+    def __init__(self, target_fps=None, levels=None, enabled=True):
+        self.target_frame_ms = 1000.0 / (target_fps or const.QUALITY_TARGET_FPS)
+        self.levels = [QualityLevel(*level) for level in (levels or const.QUALITY_LEVELS)]
+        self.enabled = enabled
+        self.level = 0
+        self.frame_index = 0
+        self.tick_ms = 0.0 # 프레임당 틱 시간 (지수 이동 평균)
+        self.render_ms = 0.0 # 프레임당 렌더링 시간 (지수 이동 평균)
+        self.ms_per_tick = 0.0 # 틱 하나의 시간 (지수 이동 평균)
+        self.render_ms_by_level = {} # 떠난 단계별 렌더링 시간 추정치
+        self._ms_since_change = 0.0
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def frame_ms(self):
+        return self.tick_ms + self.render_ms
+
+    def tick_budget_ms(self):
+        """이번 프레임에서 틱 진행에 쓸 수 있는 시간 (목표 프레임 시간 - 렌더링 시간)"""
+        return max(0.0, self.target_frame_ms - self.render_ms)
+
+    def should_refresh(self, interval_frames):
+        return interval_frames <= 1 or self.frame_index % interval_frames == 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if not self.enabled: self._set_level(0)
+        self._ms_since_change = 0.0
+
+    def projected_frame_ms(self, level):
+        """level에서의 예상 프레임 시간 (렌더링 추정치 + 프레임당 최대 틱 수만큼의 틱 시간)"""
+        render_ms = self.render_ms if level == self.level else self.render_ms_by_level.get(level, self.render_ms)
+        return render_ms + self.ms_per_tick * self.levels[level].max_ticks_per_frame
+
+    def _set_level(self, level):
+        if level == self.level: return
+        self.render_ms_by_level[self.level] = self.render_ms
+        self.level = level
+        self.render_ms = self.render_ms_by_level.pop(level, self.render_ms)
+
+    def record_frame(self, tick_ms, render_ms, ticks_run=1):
+        """한 프레임의 측정값(ticks_run틱에 tick_ms)을 반영하고, 필요하면 단계를 바꿉니다. 단계가 바뀌면 True."""
+        alpha = const.QUALITY_EMA_ALPHA
+        self.tick_ms += (tick_ms - self.tick_ms) * alpha
+        self.render_ms += (render_ms - self.render_ms) * alpha
+        if ticks_run > 0: self.ms_per_tick += (tick_ms / ticks_run - self.ms_per_tick) * alpha
+        decay = min(1.0, (tick_ms + render_ms) / const.QUALITY_RENDER_ESTIMATE_DECAY_MS)
+        for level, estimate in self.render_ms_by_level.items():
+            self.render_ms_by_level[level] = estimate + (self.render_ms - estimate) * decay
+        self.frame_index += 1
+        self._ms_since_change += tick_ms + render_ms
+        if not self.enabled or self._ms_since_change < const.QUALITY_ADJUST_COOLDOWN_MS: return False
+
+        previous_level = self.level
+        if self.frame_ms() > self.target_frame_ms * const.QUALITY_DOWNGRADE_MARGIN:
+            self._set_level(min(self.level + 1, len(self.levels) - 1))
+        elif self.level > 0 and self.projected_frame_ms(self.level - 1) < self.target_frame_ms * const.QUALITY_UPGRADE_MARGIN:
+            self._set_level(self.level - 1)
+        if self.level == previous_level: return False
+        self._ms_since_change = 0.0
+        return True
+
+    def hud_line(self):
+        mode = "auto" if self.enabled else "fixed"
+        return (f"Quality: L{self.level} {mode} ({self.frame_ms():.1f}/{self.target_frame_ms:.1f} ms, "
+                f"render {self.render_ms:.1f})")
@@ -0,0 +1,112 @@
+# run_statistics.py
+import json
+import math
+import os
+import time
+import constants as const
+
+class SpeciesStatistics:
+    """한 종의 개체 수에 대한 온라인 통계 (Welford 평균/분산, 최솟값/최댓값, 진동 주기 추정)"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # 편차 제곱합 (Welford)
+        self.min = None
+        self.max = None
+        self.share_error_sum = 0.0 # |점유율 - 목표 점유율| 누적
+        self.luck_at_min_ticks = 0
+        self.luck_at_max_ticks = 0
+        # 진동 주기: 평균 ± 히스테리시스 밴드를 아래→위로 통과한 틱 간격의 평균
+        self.oscillation_state = 0 # -1: 밴드 아래, 1: 밴드 위, 0: 아직 모름
+        self.last_up_crossing_tick = None
+        self.period_count = 0
+        self.period_mean = 0.0
+
+    def update(self, tick, population):
+        self.count += 1
+        delta = population - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (population - self.mean)
+        self.min = population if self.min is None else min(self.min, population)
+        self.max = population if self.max is None else max(self.max, population)
+
+        band = const.STATS_OSCILLATION_HYSTERESIS * self.std()
+        if population > self.mean + band:
+            if self.oscillation_state == -1: # 위로 통과
+                if self.last_up_crossing_tick is not None:
+                    self.period_count += 1
+                    self.period_mean += ((tick - self.last_up_crossing_tick) - self.period_mean) / self.period_count
+                self.last_up_crossing_tick = tick
+            self.oscillation_state = 1
+        elif population < self.mean - band:
+            self.oscillation_state = -1
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+    def period(self):
+        return self.period_mean if self.period_count else None
+
+class RunStatistics:
+    """전체 이력을 저장하지 않고 틱마다 O(1)로 갱신되는 실행 통계"""
+    def __init__(self, species_ids):
+        self.species_ids = list(species_ids)
+        self.species = {sid: SpeciesStatistics() for sid in self.species_ids}
+        self.target_shares = {sid: getattr(const, f"TARGET_RATIO_{sid}_SHARE") for sid in self.species_ids}
+        self.ticks = 0
+        self.share_error_ticks = 0 # 전체 개체 수가 0이 아닌 틱 수 (점유율 정의 가능)
+        self.total_share_error_sum = 0.0
+        self.last_total_share_error = None
+
+    def update(self, tick, populations, species_luck):
+        self.ticks += 1
+        total = sum(populations.values())
+        total_share_error = 0.0
+        for sid in self.species_ids:
+            stats = self.species[sid]
+            stats.update(tick, populations[sid])
+            if total > 0:
+                share_error = abs(populations[sid] / total - self.target_shares[sid])
+                stats.share_error_sum += share_error
+                total_share_error += share_error
+            luck = species_luck[sid]
+            if luck <= const.LUCK_MIN: stats.luck_at_min_ticks += 1
+            elif luck >= const.LUCK_MAX: stats.luck_at_max_ticks += 1
+        if total > 0:
+            self.share_error_ticks += 1
+            self.total_share_error_sum += total_share_error
+            self.last_total_share_error = total_share_error
+
+    def mean_total_share_error(self):
+        return self.total_share_error_sum / self.share_error_ticks if self.share_error_ticks else None
+
+    def hud_lines(self):
+        if self.last_total_share_error is None: return []
+        return [f"Share err: {self.last_total_share_error:.3f} (avg {self.mean_total_share_error():.3f})"]
+
+    def summary(self):
+        species_summary = {}
+        for sid in self.species_ids:
+            stats = self.species[sid]
+            species_summary[sid] = {
+                "mean": stats.mean, "std": stats.std(), "min": stats.min, "max": stats.max,
+                "mean_share_error": stats.share_error_sum / self.share_error_ticks if self.share_error_ticks else None,
+                "target_share": self.target_shares[sid],
+                "luck_at_min_fraction": stats.luck_at_min_ticks / self.ticks if self.ticks else 0.0,
+                "luck_at_max_fraction": stats.luck_at_max_ticks / self.ticks if self.ticks else 0.0,
+                "oscillation_period_ticks": stats.period(),
+            }
+        return {"ticks": self.ticks, "mean_total_share_error": self.mean_total_share_error(),
+                "species": species_summary}
+
+    def export(self, current_tick):
+        """요약을 JSON 파일로 저장하고 경로를 반환합니다."""
+        os.makedirs(const.STATS_SAVE_PATH, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        full_path = os.path.join(const.STATS_SAVE_PATH, f"{const.STATS_FILENAME_PREFIX}{current_tick}_{timestamp}.json")
+        with open(full_path, "w", encoding="utf-8") as stats_file:
+            json.dump(self.summary(), stats_file, indent=2)
+        return full_path
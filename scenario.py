@@ -0,0 +1,126 @@
+# scenario.py
+# 시나리오 파일(JSON)로 초기 개체 수/공간 분포/운/에너지 풀을 선언하고 대량으로 생성
+import gc
+import json
+import random
+import constants as const
+from creatures import (CreatureA, CreatureB, CreatureC,
+                       CreatureD, CreatureE, CreatureF,
+                       CreatureG, CreatureH, CreatureI, create_creatures_bulk)
+from super_individual import assign_weights
+
+try:
+    import numpy as np
+except ImportError: # numpy가 없으면 random 모듈로 같은 분포를 생성 (느림)
+    np = None
+
+SPECIES_CLASSES = {
+    'A': CreatureA, 'B': CreatureB, 'C': CreatureC, 'D': CreatureD, 'E': CreatureE,
+    'F': CreatureF, 'G': CreatureG, 'H': CreatureH, 'I': CreatureI,
+}
+DISTRIBUTION_TYPES = ('uniform', 'clustered', 'banded')
+
+def load_scenario(path):
+    """시나리오 파일을 읽고 검증합니다."""
+    with open(path, "r", encoding="utf-8") as scenario_file:
+        scenario = json.load(scenario_file)
+    for sid, spec in scenario.get("species", {}).items():
+        if sid not in SPECIES_CLASSES: raise ValueError(f"Unknown species in scenario: {sid}")
+        distribution_type = spec.get("distribution", {}).get("type", "uniform")
+        if distribution_type not in DISTRIBUTION_TYPES:
+            raise ValueError(f"Unknown distribution for species {sid}: {distribution_type}")
+        if "agents" in spec and sid != 'A': # 슈퍼 개체는 A만 지원
+            raise ValueError(f"Super-individual agents are only supported for species A, not {sid}")
+    return scenario
+
+def apply_scenario_constants(scenario):
+    """월드 크기처럼 Simulation 생성 전에 정해져야 하는 값을 constants에 반영합니다."""
+    if "world_size" in scenario:
+        const.WORLD_WIDTH, const.WORLD_HEIGHT = (int(v) for v in scenario["world_size"])
+
+class _PositionSampler:
+    """numpy Generator 또는 random.Random으로 좌표 배열을 생성합니다."""
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+    def uniform(self, low, high, count):
+        if np is not None: return self.rng.uniform(low, high, count)
+        return [self.rng.uniform(low, high) for _ in range(count)]
+
+    def normal(self, centers, sigma):
+        if np is not None: return self.rng.normal(centers, sigma)
+        return [self.rng.gauss(c, sigma) for c in centers]
+
+    def choice(self, num_options, count, weights=None):
+        if np is not None: return self.rng.choice(num_options, size=count, p=weights)
+        return self.rng.choices(range(num_options), weights=weights, k=count)
+
+    def take(self, values, indices):
+        if np is not None: return np.asarray(values)[indices]
+        return [values[i] for i in indices]
+
+    def band_positions(self, starts, spans, offsets, extent):
+        if np is not None: return (starts + offsets * spans) * extent
+        return [(s + o * w) * extent for s, o, w in zip(starts, offsets, spans)]
+
+    def clip(self, values, low, high):
+        if np is not None: return np.clip(values, low, high).tolist()
+        return [max(low, min(v, high)) for v in values]
+
+def generate_positions(distribution, count, radius, sampler):
+    """분포 설정에 따라 count개의 (xs, ys) 좌표 리스트를 생성합니다."""
+    min_x, max_x = radius, const.WORLD_WIDTH - radius
+    min_y, max_y = radius, const.WORLD_HEIGHT - radius
+    distribution_type = distribution.get("type", "uniform")
+
+    if distribution_type == "clustered":
+        # 군집 중심을 균일하게 뽑고, 각 개체는 임의의 중심 주위에 정규분포로 배치
+        num_clusters = max(1, int(distribution.get("clusters", 5)))
+        sigma = float(distribution.get("sigma", 0.05 * min(const.WORLD_WIDTH, const.WORLD_HEIGHT)))
+        center_x = sampler.uniform(min_x, max_x, num_clusters)
+        center_y = sampler.uniform(min_y, max_y, num_clusters)
+        assignment = sampler.choice(num_clusters, count)
+        xs = sampler.normal(sampler.take(center_x, assignment), sigma)
+        ys = sampler.normal(sampler.take(center_y, assignment), sigma)
+    elif distribution_type == "banded":
+        # 축(axis) 방향의 띠 [시작 비율, 끝 비율] 안에 균일 배치, 띠 너비에 비례해 개체 배분
+        axis = distribution.get("axis", "y")
+        bands = distribution.get("bands", [[0.0, 0.5]])
+        widths = [end - start for start, end in bands]
+        band_index = sampler.choice(len(bands), count, [w / sum(widths) for w in widths])
+        starts = sampler.take([start for start, _ in bands], band_index)
+        spans = sampler.take(widths, band_index)
+        extent = const.WORLD_HEIGHT if axis == "y" else const.WORLD_WIDTH
+        along = sampler.band_positions(starts, spans, sampler.uniform(0.0, 1.0, count), extent)
+        across = sampler.uniform(min_x, max_x, count) if axis == "y" else sampler.uniform(min_y, max_y, count)
+        xs, ys = (across, along) if axis == "y" else (along, across)
+    else:
+        xs = sampler.uniform(min_x, max_x, count)
+        ys = sampler.uniform(min_y, max_y, count)
+    return sampler.clip(xs, min_x, max_x), sampler.clip(ys, min_y, max_y)
+
+def populate_simulation(simulation, scenario):
+    """시나리오에 따라 시뮬레이션의 초기 개체, 운, 에너지 풀을 설정합니다 (기존 개체는 제거)."""
+    sampler = _PositionSampler(scenario.get("seed"))
+    if "energy_pool" in scenario: simulation.global_energy_pool = float(scenario["energy_pool"])
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable() # 수백만 개체 생성 중 반복되는 GC 순회 방지
+    try:
+        for sid, creature_class in SPECIES_CLASSES.items():
+            spec = scenario.get("species", {}).get(sid, {})
+            count = int(spec.get("count", getattr(const, f"CREATURE_{sid}_INITIAL_COUNT")))
+            luck = float(spec.get("luck", simulation.species_luck[sid]))
+            simulation.species_luck[sid] = max(const.LUCK_MIN, min(const.LUCK_MAX, luck))
+            num_agents = count
+            if "agents" in spec: # count마리를 agents개의 슈퍼 개체로 나눠 표현
+                if not simulation.super_individuals:
+                    raise ValueError("Scenario uses super-individual agents but super-individual mode is off")
+                num_agents = min(count, int(spec["agents"]))
+            radius = getattr(const, f"CREATURE_{sid}_RADIUS")
+            xs, ys = generate_positions(spec.get("distribution", {}), num_agents, radius, sampler) if num_agents > 0 else ([], [])
+            creatures = create_creatures_bulk(creature_class, xs, ys, simulation.species_luck[sid])
+            if num_agents != count: assign_weights(creatures, count)
+            setattr(simulation, f"creatures_{sid.lower()}", creatures)
+    finally:
+        if gc_was_enabled: gc.enable()
@@ -0,0 +1,241 @@
+# shared_view.py
+# 시뮬레이션 프로세스와 뷰어 프로세스 분리: 이중 버퍼 공유 메모리로 상태를 전달
+import struct
+from array import array
+from multiprocessing import Process, shared_memory
+
+import pygame
+import constants as const
+from camera import Camera
+from luck_tuner import apply_constants_override
+from simulation import Simulation
+
+SPECIES_IDS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']
+NUM_SPECIES = len(SPECIES_IDS)
+
+# 제어 영역: 필드마다 쓰는 쪽이 하나뿐이도록 오프셋을 나눔 (전체 구조체를 읽고-고쳐-쓰면 상대의 기록을 덮어씀)
+ACTIVE_INDEX_OFFSET = 0 # 현재 읽을 버퍼 번호 (시뮬레이션만 기록)
+STOP_FLAG_OFFSET = 8 # 종료 요청 (뷰어만 기록)
+LAYOUT_OFFSET = 16 # 용량, 월드 크기 (생성 시 한 번만 기록)
+LAYOUT_FORMAT = '<qdd'
+CONTROL_SIZE = LAYOUT_OFFSET + struct.calcsize(LAYOUT_FORMAT)
+# 버퍼 헤더: 시퀀스 번호 (기록 중이면 홀수), 틱, 게시한 개체 수, 전체 에이전트 수 (용량 초과 시 게시한 수보다 큼),
+# 에너지, 종별 개체 수, 종별 운
+BUFFER_HEADER_FORMAT = f'<qqqqd{NUM_SPECIES}q{NUM_SPECIES}d'
+BUFFER_HEADER_SIZE = struct.calcsize(BUFFER_HEADER_FORMAT)
+
+def _buffer_size(capacity):
+    size = BUFFER_HEADER_SIZE + capacity * 8 + capacity # float32 (x, y) + uint8 종 번호
+    return (size + 7) // 8 * 8
+
+def _buffer_offset(capacity, index):
+    return CONTROL_SIZE + index * _buffer_size(capacity)
+
+class SharedStatePublisher:
+    """시뮬레이션 쪽: 비활성 버퍼에 상태를 기록한 뒤 활성 버퍼를 교체합니다."""
+    def __init__(self, capacity=None, name=None, create=True):
+        self.capacity = capacity or const.SHARED_VIEW_CAPACITY
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=CONTROL_SIZE + 2 * _buffer_size(self.capacity))
+            struct.pack_into('<q', self.shm.buf, ACTIVE_INDEX_OFFSET, 0)
+            struct.pack_into('<q', self.shm.buf, STOP_FLAG_OFFSET, 0)
+            struct.pack_into(LAYOUT_FORMAT, self.shm.buf, LAYOUT_OFFSET, self.capacity,
+                             float(const.WORLD_WIDTH), float(const.WORLD_HEIGHT))
+        else: # 기존 영역에 붙을 때는 생성한 쪽의 용량을 따름
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.capacity = struct.unpack_from('<q', self.shm.buf, LAYOUT_OFFSET)[0]
+        self.name = self.shm.name
+        self.sequence = [0, 0]
+        self.active_index = 0 # 활성 버퍼 번호는 게시하는 쪽만 바꾸므로 로컬 값을 기준으로 삼음
+
+    def stop_requested(self):
+        return struct.unpack_from('<q', self.shm.buf, STOP_FLAG_OFFSET)[0] != 0
+
+    def request_stop(self):
+        struct.pack_into('<q', self.shm.buf, STOP_FLAG_OFFSET, 1)
+
+    def _species_strides(self, creature_lists):
+        """용량을 상위 포식자부터 배정하고, 남은 용량보다 많은 종은 일정 간격으로 솎아 게시할 간격을 정합니다."""
+        strides = [1] * NUM_SPECIES
+        remaining = self.capacity
+        for species_index in reversed(range(NUM_SPECIES)): # I -> A (수가 가장 많은 A가 나머지를 사용)
+            count = len(creature_lists[species_index])
+            if count > remaining: strides[species_index] = -(-count // remaining) if remaining > 0 else 0
+            shown = 0 if strides[species_index] == 0 else -(-count // strides[species_index])
+            remaining -= shown
+        return strides
+
+    def publish(self, simulation):
+        target = 1 - self.active_index
+        offset = _buffer_offset(self.capacity, target)
+
+        creature_lists = [getattr(simulation, f"creatures_{sid.lower()}") for sid in SPECIES_IDS]
+        coords = array('f')
+        species = array('B')
+        for species_index, (creature_list, stride) in enumerate(zip(creature_lists, self._species_strides(creature_lists))):
+            if stride == 0: continue
+            for creature in creature_list[::stride] if stride > 1 else creature_list:
+                coords.append(creature.x); coords.append(creature.y)
+                species.append(species_index)
+        count = len(species)
+        total_agents = sum(len(creature_list) for creature_list in creature_lists)
+
+        self.sequence[target] += 1 # 홀수: 기록 중
+        struct.pack_into('<q', self.shm.buf, offset, self.sequence[target])
+        positions_offset = offset + BUFFER_HEADER_SIZE
+        species_offset = positions_offset + self.capacity * 8
+        self.shm.buf[positions_offset:positions_offset + count * 8].cast('f')[:] = coords
+        self.shm.buf[species_offset:species_offset + count] = species
+        populations = simulation._get_population_counts()
+        struct.pack_into(BUFFER_HEADER_FORMAT, self.shm.buf, offset, self.sequence[target], # 아직 홀수
+                         simulation.current_tick, count, total_agents, simulation.global_energy_pool,
+                         *(populations[sid] for sid in SPECIES_IDS),
+                         *(simulation.species_luck[sid] for sid in SPECIES_IDS))
+        self.sequence[target] += 1 # 짝수: 기록 완료. 헤더의 다른 필드를 모두 쓴 뒤 마지막으로 기록
+        struct.pack_into('<q', self.shm.buf, offset, self.sequence[target])
+        struct.pack_into('<q', self.shm.buf, ACTIVE_INDEX_OFFSET, target)
+        self.active_index = target
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink: self.shm.unlink()
+
+class SharedStateView:
+    """뷰어 쪽에서 읽은 한 프레임. positions/species는 공유 메모리를 직접 가리킵니다 (복사 없음)."""
+    def __init__(self, reader, index):
+        self._reader = reader
+        self._offset = _buffer_offset(reader.capacity, index)
+        header = struct.unpack_from(BUFFER_HEADER_FORMAT, reader.shm.buf, self._offset)
+        self.sequence, self.tick, self.count, self.total_agents, self.energy = header[:5]
+        self.populations = dict(zip(SPECIES_IDS, header[5:5 + NUM_SPECIES]))
+        self.luck = dict(zip(SPECIES_IDS, header[5 + NUM_SPECIES:]))
+        positions_offset = self._offset + BUFFER_HEADER_SIZE
+        species_offset = positions_offset + reader.capacity * 8
+        self.positions = reader.shm.buf[positions_offset:positions_offset + self.count * 8].cast('f')
+        self.species = reader.shm.buf[species_offset:species_offset + self.count]
+
+    def is_consistent(self):
+        """읽는 동안 시뮬레이션이 이 버퍼를 덮어쓰지 않았는지 확인합니다."""
+        if self.sequence % 2: return False
+        return struct.unpack_from('<q', self._reader.shm.buf, self._offset)[0] == self.sequence
+
+    def release(self):
+        self.positions.release()
+        self.species.release()
+
+class SharedStateReader:
+    def __init__(self, name):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.capacity, self.world_width, self.world_height = struct.unpack_from(LAYOUT_FORMAT, self.shm.buf, LAYOUT_OFFSET)
+
+    def latest(self):
+        active_index = struct.unpack_from('<q', self.shm.buf, ACTIVE_INDEX_OFFSET)[0]
+        return SharedStateView(self, active_index)
+
+    def close(self):
+        self.shm.close()
+
+def run_simulation_process(shm_name, num_ticks=None, publish_every_ticks=None, constants_override=None, simulation_kwargs=None,
+                           export_statistics=False):
+    """시뮬레이션 프로세스 본체: 창 없이 최대 속도로 진행하며 공유 메모리에 상태를 게시합니다.
+    실행 통계 요약은 export_statistics가 참일 때만 저장합니다."""
+    if constants_override: apply_constants_override(constants_override)
+    pygame.font.init()
+    publish_every_ticks = publish_every_ticks or const.SHARED_VIEW_PUBLISH_EVERY_TICKS
+
+    publisher = SharedStatePublisher(name=shm_name, create=False)
+    simulation = Simulation(headless=True, **(simulation_kwargs or {}))
+    publisher.publish(simulation)
+    try:
+        while not publisher.stop_requested():
+            if num_ticks is not None and simulation.current_tick >= num_ticks: break
+            simulation._advance_tick()
+            if simulation.current_tick % publish_every_ticks == 0: publisher.publish(simulation)
+        if export_statistics: simulation._export_run_statistics()
+    finally:
+        simulation.close()
+        publisher.close()
+
+class SharedStateViewer:
+    """뷰어 프로세스: 공유 메모리의 최신 버퍼를 읽어 그립니다. 느려도 시뮬레이션에는 영향을 주지 않습니다."""
+    def __init__(self, reader):
+        self.reader = reader
+        self.screen = pygame.display.set_mode((const.SIMULATION_AREA_WIDTH, const.SIMULATION_AREA_HEIGHT))
+        pygame.display.set_caption("Ecosystem Simulation - Viewer")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, const.HUD_FONT_SIZE)
+        self.camera = Camera(self.screen.get_rect(), reader.world_width, reader.world_height)
+        self.species_colors = [getattr(const, f"GRAPH_LINE_COLOR_{sid}") for sid in SPECIES_IDS]
+        self.species_radii = [getattr(const, f"CREATURE_{sid}_RADIUS") for sid in SPECIES_IDS]
+        self.torn_frames = 0
+        self.is_dragging_camera = False
+
+    def _handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: return False
+            if event.type == pygame.MOUSEWHEEL:
+                self.camera.zoom_at(const.CAMERA_ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1: self.is_dragging_camera = True
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1: self.is_dragging_camera = False
+            elif event.type == pygame.MOUSEMOTION and self.is_dragging_camera:
+                self.camera.pan(-event.rel[0], -event.rel[1])
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_h: self.camera.reset()
+        return True
+
+    def _draw(self, view):
+        self.screen.fill(const.BLACK)
+        left, top, right, bottom = self.camera.visible_world_rect()
+        zoom = self.camera.zoom
+        positions = view.positions
+        for i, species_index in enumerate(view.species):
+            x = positions[2 * i]; y = positions[2 * i + 1]
+            radius = self.species_radii[species_index]
+            if x + radius < left or x - radius > right or y + radius < top or y - radius > bottom: continue
+            sx, sy = self.camera.world_to_screen(x, y)
+            pygame.draw.circle(self.screen, self.species_colors[species_index], (int(sx), int(sy)),
+                               max(1, int(radius * zoom)))
+
+        lines = [f"Tick: {view.tick}  Energy: {view.energy:.2f}  Torn frames: {self.torn_frames}"]
+        if view.total_agents > view.count: lines.append(f"Shown: {view.count}/{view.total_agents} (capacity)")
+        lines += [f"{sid}: {view.populations[sid]} (L: {view.luck[sid]:.2f})" for sid in SPECIES_IDS]
+        y_offset = 5
+        for line in lines:
+            self.screen.blit(self.font.render(line, True, const.GREY), (5, y_offset))
+            y_offset += const.HUD_FONT_SIZE * 0.8
+
+    def _draw_latest(self):
+        """최신 버퍼를 그립니다. 그리는 동안 덮어써졌으면 다시 읽고, 끝내 실패하면 False (화면을 바꾸지 않음)."""
+        for _ in range(const.SHARED_VIEW_READ_RETRIES):
+            view = self.reader.latest()
+            try:
+                if view.sequence % 2: # 기록 중인 버퍼: 다시 읽음
+                    self.torn_frames += 1
+                    continue
+                self._draw(view)
+                if view.is_consistent(): return True
+                self.torn_frames += 1
+            finally:
+                view.release()
+        return False
+
+    def run(self):
+        while self._handle_events():
+            if self._draw_latest(): pygame.display.flip()
+            self.clock.tick(const.FPS)
+
+def run_split(num_ticks=None, constants_override=None, simulation_kwargs=None, export_statistics=False):
+    """시뮬레이션은 별도 프로세스에서, 뷰어는 현재 프로세스에서 실행합니다."""
+    publisher = SharedStatePublisher()
+    simulation_process = Process(target=run_simulation_process, name="simulation",
+                                 args=(publisher.name, num_ticks, None, constants_override, simulation_kwargs, export_statistics))
+    simulation_process.start()
+    reader = SharedStateReader(publisher.name)
+    try:
+        SharedStateViewer(reader).run()
+    finally:
+        publisher.request_stop()
+        simulation_process.join(timeout=const.SHARED_VIEW_SHUTDOWN_TIMEOUT_S)
+        if simulation_process.is_alive(): simulation_process.terminate()
+        reader.close()
+        publisher.close(unlink=True)
@@ -5,14 +5,34 @@ import math
 import os
 import time
 import constants as const
+from camera import Camera
+from capture import FrameCapture
+from creature_pool import CreaturePool
+from history_store import MappedHistoryStore
+from memory_report import MemoryReporter
+from parallel_stepping import ParallelStepper
+from population_graph import GraphSaver, draw_population_graph
+from quality_controller import QualityController
+from run_statistics import RunStatistics
+from scenario import populate_simulation
+from spatial import SpatialGrid
+from super_individual import SuperIndividualBudget, total_weight
 from creatures import (CreatureA, CreatureB, CreatureC, 
                        CreatureD, CreatureE, CreatureF, 
                        CreatureG, CreatureH, CreatureI)
 
 class Simulation:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((const.SCREEN_WIDTH, const.SCREEN_HEIGHT))
-        pygame.display.set_caption("Ecosystem Simulation - 9 Species Fixed")
+    def __init__(self, headless=False, stepping_mode=None, use_creature_pool=None, scenario=None,
+                 use_super_individuals=None, memory_report=None):
+        # 메모리 보고가 켜져 있으면 다른 할당보다 먼저 tracemalloc 추적을 시작
+        if memory_report is None: memory_report = const.MEMORY_REPORT_ENABLED
+        self.memory_reporter = MemoryReporter() if memory_report else None
+        self.headless = headless
+        if headless: # 창 없이 오프스크린 surface에 렌더링
+            self.screen = pygame.Surface((const.SCREEN_WIDTH, const.SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((const.SCREEN_WIDTH, const.SCREEN_HEIGHT))
+            pygame.display.set_caption("Ecosystem Simulation - 9 Species Fixed")
         self.clock = pygame.time.Clock()
         
         try:
@@ -41,6 +61,10 @@ class Simulation:
         self.species_ids = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']
         self.species_luck = {sid: const.LUCK_DEFAULT for sid in self.species_ids}
         self.population_history = {sid: [] for sid in self.species_ids}
+        self.peak_newborns_per_tick = {sid: 0 for sid in self.species_ids} # 메모리 보고서용: 한 틱에 태어난 최대 개체 수
+        self.run_statistics = RunStatistics(self.species_ids) # 이력 길이와 무관한 누적 통계
+        self.history_store = None # MappedHistoryStore (history_store.py), 설정 시 전체 이력을 파일에 기록
+        self.graph_window_ticks = None # 그래프에 표시할 최근 틱 수 (None: 메모리 이력 전체)
         
         self.current_tick = 0
         self.last_simulation_update_time = pygame.time.get_ticks()
@@ -56,11 +80,45 @@ class Simulation:
         self.speed_factor_index = 0
         self.current_simulation_speed_factor = const.FAST_FORWARD_FACTORS[self.speed_factor_index]
 
-        self._create_initial_creatures()
+        # 카메라 뷰포트 및 렌더링 컬링용 공간 인덱스 (종별, 틱 진행 중 생성/이동/사망 시 갱신)
+        self.camera = Camera((0, 0, const.SIMULATION_AREA_WIDTH, const.SIMULATION_AREA_HEIGHT),
+                             const.WORLD_WIDTH, const.WORLD_HEIGHT)
+        self.spatial_index = {sid: SpatialGrid(const.SPATIAL_GRID_CELL_SIZE) for sid in self.species_ids}
+        self.is_dragging_camera = False
+
+        self.frame_capture = None # FrameCapture (capture.py), 설정 시 프레임 캡처 모드
+        self.graph_saver = None # GraphSaver (population_graph.py), 첫 그래프 저장 요청 시 생성
+        # 창 모드에서 목표 프레임 시간을 지키도록 렌더링 품질/프레임당 틱 수를 조절 (quality_controller.py)
+        self.quality_controller = None if headless else QualityController(enabled=const.QUALITY_ADAPTIVE_ENABLED)
+        self._hud_blits = None # 마지막으로 렌더링한 HUD 문자열 (갱신 간격 사이에 재사용)
+        self._graph_panel_cache = None # 마지막으로 그린 그래프 패널
+        self.capture_ticks_per_frame = const.CAPTURE_TICKS_PER_FRAME
+
+        # 영양 단계 행동 진행 방식: 'sequential' (B→I 순서) 또는 'redblack' (parallel_stepping.py)
+        self.stepping_mode = stepping_mode or const.STEPPING_MODE
+        if self.stepping_mode not in ('sequential', 'redblack'):
+            raise ValueError(f"Unknown stepping mode: {self.stepping_mode}")
+        self.parallel_stepper = ParallelStepper() if self.stepping_mode == 'redblack' else None
+
+        # 죽은 개체를 생성/번식에 재사용하는 종별 개체 풀 (creature_pool.py)
+        if use_creature_pool is None: use_creature_pool = const.CREATURE_POOL_ENABLED
+        self.creature_pool = CreaturePool() if use_creature_pool else None
+
+        # A 슈퍼 개체 모드: 에이전트 하나가 weight마리를 대표, 에이전트 수는 예산 안으로 유지 (super_individual.py)
+        if use_super_individuals is None: use_super_individuals = const.SUPER_INDIVIDUAL_A_ENABLED
+        self.super_individuals = SuperIndividualBudget() if use_super_individuals else None
+
+        if scenario is not None: populate_simulation(self, scenario) # 시나리오 파일의 개체 수/분포로 대량 생성
+        else: self._create_initial_creatures()
+        self._rebuild_spatial_index()
+
+    def _rebuild_spatial_index(self):
+        for sid in self.species_ids:
+            self.spatial_index[sid].rebuild(getattr(self, f"creatures_{sid.lower()}"))
 
     def _get_random_position(self, radius):
-        x = random.uniform(radius, const.SIMULATION_AREA_WIDTH - radius)
-        y = random.uniform(radius, const.SIMULATION_AREA_HEIGHT - radius)
+        x = random.uniform(radius, const.WORLD_WIDTH - radius)
+        y = random.uniform(radius, const.WORLD_HEIGHT - radius)
         return x, y
 
     def _create_initial_creatures(self):
@@ -89,6 +147,17 @@ class Simulation:
     def _handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT: self.is_running = False
+            # 카메라: 휠 확대/축소, 왼쪽 버튼 드래그 이동
+            if event.type == pygame.MOUSEWHEEL:
+                mouse_pos = pygame.mouse.get_pos()
+                if self.camera.viewport.collidepoint(mouse_pos):
+                    self.camera.zoom_at(const.CAMERA_ZOOM_STEP ** event.y, mouse_pos)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.is_dragging_camera = self.camera.viewport.collidepoint(event.pos)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.is_dragging_camera = False
+            elif event.type == pygame.MOUSEMOTION and self.is_dragging_camera:
+                self.camera.pan(-event.rel[0], -event.rel[1])
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_0 or event.key == pygame.K_BACKQUOTE: self.graph_mode = 'all'
                 elif event.key == pygame.K_1: self.graph_mode = 'A'
@@ -100,6 +169,15 @@ class Simulation:
                     self.speed_factor_index = (self.speed_factor_index + 1) % len(const.FAST_FORWARD_FACTORS)
                     self.current_simulation_speed_factor = const.FAST_FORWARD_FACTORS[self.speed_factor_index]
                 elif event.key == pygame.K_s: self._save_graph_as_image()
+                elif event.key == pygame.K_v: self._toggle_frame_capture()
+                elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS): self.camera.zoom_at(const.CAMERA_ZOOM_STEP)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS): self.camera.zoom_at(1 / const.CAMERA_ZOOM_STEP)
+                elif event.key == pygame.K_h: self.camera.reset()
+                elif event.key == pygame.K_m: self.print_memory_report()
+                elif event.key == pygame.K_PAGEUP: self._zoom_graph(2)
+                elif event.key == pygame.K_PAGEDOWN: self._zoom_graph(0.5)
+                elif event.key == pygame.K_q and self.quality_controller: self.quality_controller.toggle()
+                self._invalidate_render_caches() # 키 입력 결과가 HUD/그래프에 바로 보이도록
                 # K_n (새로운 종 추가) 키 이벤트 제거
 
     # _add_new_species 메서드 제거
@@ -107,36 +185,55 @@ class Simulation:
     def _spawn_creature_a(self):
         if self.current_tick > 0 and self.current_tick % const.CREATURE_A_CREATION_PERIOD_TICKS == 0:
             num_to_create_a = max(0, int(const.CREATURE_A_BASE_CREATION_COUNT * self.species_luck['A']))
+            positions = []
             for _ in range(num_to_create_a):
                 if self.global_energy_pool >= const.CREATURE_A_CREATION_COST:
                     self.global_energy_pool -= const.CREATURE_A_CREATION_COST
-                    x, y = self._get_random_position(const.CREATURE_A_RADIUS)
-                    self.creatures_a.append(CreatureA(x, y, self.species_luck['A']))
+                    positions.append(self._get_random_position(const.CREATURE_A_RADIUS))
                 else: break
-
-    def _update_species_actions(self, predators_list, prey_list_or_id_key, species_id_predator):
-        """특정 포식자 종의 행동을 업데이트하는 일반화된 함수"""
+            # 위치를 먼저 정한 뒤 한 번에 생성 (풀이 있으면 재사용)
+            if self.creature_pool:
+                new_creatures = self.creature_pool.acquire_batch(CreatureA, positions, self.species_luck['A'])
+            else:
+                new_creatures = [CreatureA(x, y, self.species_luck['A']) for x, y in positions]
+            grid = self.spatial_index['A']
+            for creature in new_creatures: grid.insert(creature)
+            self.creatures_a.extend(new_creatures)
+
+    def _update_species_actions(self, predators_list, prey_list_or_id_key, species_id_predator, target_finder=None):
+        """특정 포식자 종의 행동을 업데이트하는 일반화된 함수
+        target_finder가 주어지면 predator.find_target 대신 target_finder(포식자 인덱스)로 목표를 찾습니다."""
         newly_born = []
+        grid = self.spatial_index[species_id_predator] # 레드/블랙 진행에서도 종별로 한 스레드만 갱신
         # prey_list_or_id_key가 문자열이면 self에서 해당 리스트를 가져옴. 아니면 직접 리스트로 간주.
         actual_prey_list = getattr(self, f"creatures_{prey_list_or_id_key.lower()}", []) \
                            if isinstance(prey_list_or_id_key, str) else prey_list_or_id_key
 
-        for predator in predators_list:
+        for index, predator in enumerate(predators_list):
             if predator.is_alive:
-                target = predator.find_target(actual_prey_list)
+                target = target_finder(index) if target_finder else predator.find_target(actual_prey_list)
                 predator.move(target)
+                grid.update(predator)
                 if target and target.is_alive:
-                    predator.hunt(target)
+                    # 슈퍼 개체는 접촉만으로 매 틱 한 마리씩 잡히지 않도록 국소 밀도에 따른 확률로 사냥
+                    if target.weight == 1 or random.random() < self.super_individuals.hunt_probability(
+                            predator, target, self.spatial_index[target.species_name]):
+                        predator.hunt(target)
                 
                 if predator.can_reproduce():
-                    offspring = predator.attempt_reproduction()
+                    offspring = predator.attempt_reproduction(self.creature_pool)
                     if offspring:
                         offspring.luck = self.species_luck[species_id_predator]
+                        grid.insert(offspring)
                         newly_born.append(offspring)
         predators_list.extend(newly_born)
+        if len(newly_born) > self.peak_newborns_per_tick[species_id_predator]:
+            self.peak_newborns_per_tick[species_id_predator] = len(newly_born)
 
 
     def _update_creatures_actions(self):
+        if self.parallel_stepper:
+            self.parallel_stepper.step(self); return
         self._update_species_actions(self.creatures_b, self.creatures_a, 'B') # B hunts A
         self._update_species_actions(self.creatures_c, self.creatures_b, 'C') # C hunts B
         self._update_species_actions(self.creatures_d, self.creatures_c, 'D') # D hunts C
@@ -173,8 +270,10 @@ class Simulation:
                 if creature.is_alive:
                     new_creature_lists[species_id].append(creature)
                 else:
+                    self.spatial_index[species_id].remove(creature)
                     if creature.age_ticks >= const.CREATURE_LIFESPAN_TICKS:
                         self.global_energy_pool += creature.current_energy_level
+                    if self.creature_pool: self.creature_pool.release(creature)
         
         self.creatures_a = new_creature_lists['A']
         self.creatures_b = new_creature_lists['B']
@@ -186,10 +285,17 @@ class Simulation:
         self.creatures_h = new_creature_lists['H']
         self.creatures_i = new_creature_lists['I']
 
+    def _rebalance_super_individuals(self):
+        if self.super_individuals and self.current_tick % const.SUPER_INDIVIDUAL_REBALANCE_PERIOD_TICKS == 0:
+            agent_count = len(self.creatures_a)
+            self.creatures_a = self.super_individuals.rebalance(self.creatures_a, self.creature_pool)
+            # 합치기는 위치도 바꾸므로 에이전트 수가 바뀐 경우에만 인덱스를 다시 만듦 (예산 조정 시에만 발생)
+            if len(self.creatures_a) != agent_count: self.spatial_index['A'].rebuild(self.creatures_a)
+
     def _update_luck_system(self):
         if self.current_tick > 0 and self.current_tick % const.LUCK_ADJUSTMENT_PERIOD_TICKS == 0:
-            # 모든 종의 개체 수 계산
-            populations = {sid: len(getattr(self, f"creatures_{sid.lower()}")) for sid in self.species_ids}
+            # 모든 종의 개체 수 계산 (슈퍼 개체는 실제 개체 수)
+            populations = self._get_population_counts()
             total_creatures = sum(populations.values())
 
             if total_creatures > 0:
@@ -222,8 +328,11 @@ class Simulation:
 
 
     def _update_population_history(self):
+        populations = self._get_population_counts()
         for sid in self.species_ids:
-            self.population_history[sid].append(len(getattr(self, f"creatures_{sid.lower()}")))
+            self.population_history[sid].append(populations[sid])
+        if self.history_store:
+            self.history_store.append(self.current_tick, populations, self.species_luck, self.global_energy_pool)
 
         if const.GRAPH_MAX_HISTORY > 0:
             for key in self.population_history:
@@ -231,168 +340,37 @@ class Simulation:
                     self.population_history[key].pop(0)
     
     def _draw_population_graph(self, target_surface=None, history_data_override=None, graph_rect_override=None, full_history_mode=False):
-        surface_to_draw_on = target_surface if target_surface else self.screen
-        current_history_source = history_data_override if history_data_override else self.population_history
-        graph_rect = graph_rect_override if graph_rect_override else self.graph_surface_rect
-
-        pygame.draw.rect(surface_to_draw_on, const.GRAPH_BG_COLOR, graph_rect)
-        pygame.draw.rect(surface_to_draw_on, const.GRAPH_AXIS_COLOR, graph_rect, 1)
-
-        species_map = {
-            'A': (const.GRAPH_LINE_COLOR_A, current_history_source.get('A', [])),
-            'B': (const.GRAPH_LINE_COLOR_B, current_history_source.get('B', [])),
-            'C': (const.GRAPH_LINE_COLOR_C, current_history_source.get('C', [])),
-            'D': (const.GRAPH_LINE_COLOR_D, current_history_source.get('D', [])),
-            'E': (const.GRAPH_LINE_COLOR_E, current_history_source.get('E', [])),
-            'F': (const.GRAPH_LINE_COLOR_F, current_history_source.get('F', [])),
-            'G': (const.GRAPH_LINE_COLOR_G, current_history_source.get('G', [])),
-            'H': (const.GRAPH_LINE_COLOR_H, current_history_source.get('H', [])),
-            'I': (const.GRAPH_LINE_COLOR_I, current_history_source.get('I', []))
-        }
-        
-        active_keys_to_draw = []
-        if self.graph_mode == 'all' or full_history_mode:
-            active_keys_to_draw = self.species_ids # 모든 종을 그림
-        elif self.graph_mode in ['A', 'B', 'C']: # 개별 모드는 A, B, C만 지원
-            active_keys_to_draw = [self.graph_mode]
-        else: # 그 외의 경우 (예: self.graph_mode가 D, E.. 로 설정될 수 있는 키가 없다면)
-             active_keys_to_draw = [] # 또는 'all'로 기본 설정
-
-        has_data_to_draw = False
-        for key in active_keys_to_draw:
-            if key in species_map and species_map[key][1]:
-                has_data_to_draw = True; break
-        if not has_data_to_draw: return
-
-        max_pop_overall = 1; max_history_len_for_scale = 0
-        for key in active_keys_to_draw:
-            if key not in species_map: continue
-            history = species_map[key][1]
-            if history:
-                max_pop_overall = max(max_pop_overall, max(history))
-                max_history_len_for_scale = max(max_history_len_for_scale, len(history))
-        
-        if max_history_len_for_scale < (1 if full_history_mode and max_history_len_for_scale == 1 else 2) : return
-
-        y_axis_label_space = const.GRAPH_PADDING*2 + self.graph_font.get_height()
-        x_axis_label_space = const.GRAPH_PADDING*2 + self.graph_font.get_height()
-        title_space = const.GRAPH_PADDING + self.graph_font.get_height() + 5
-        legend_space_per_item = self.graph_font.get_height() + 2
-        max_pop_text_height = self.graph_font.get_height() + 5
-
-
-        inner_graph_x = graph_rect.left + y_axis_label_space
-        inner_graph_y = graph_rect.top + title_space + max_pop_text_height # 제목 및 Max Pop 위한 공간
-        
-        # 범례가 너무 길어지면 그래프 영역 침범 가능, 저장 시에는 범례 위치 조정 또는 별도 영역 필요
-        available_legend_height = graph_rect.height - (title_space + max_pop_text_height + x_axis_label_space + const.GRAPH_PADDING)
-        num_legend_items_can_fit = available_legend_height // legend_space_per_item
-
-        inner_graph_width = graph_rect.width - y_axis_label_space - const.GRAPH_PADDING
-        # 범례 공간을 위해 그래프 높이 조정 (화면 표시 시)
-        if not full_history_mode and (self.graph_mode == 'all' or len(active_keys_to_draw) > 1) :
-             # 화면 표시용 'all' 모드일 때만 범례 공간 확보
-             legend_total_height = len(active_keys_to_draw) * legend_space_per_item
-             inner_graph_height = graph_rect.height - title_space - max_pop_text_height - x_axis_label_space - const.GRAPH_PADDING - legend_total_height
-        else:
-             inner_graph_height = graph_rect.height - title_space - max_pop_text_height - x_axis_label_space - const.GRAPH_PADDING
-
-
-
-        if inner_graph_width <=10 or inner_graph_height <=10: return
-
-        pygame.draw.line(surface_to_draw_on, const.GRAPH_AXIS_COLOR, (inner_graph_x, inner_graph_y + inner_graph_height), (inner_graph_x + inner_graph_width, inner_graph_y + inner_graph_height), 1)
-        pygame.draw.line(surface_to_draw_on, const.GRAPH_AXIS_COLOR, (inner_graph_x, inner_graph_y), (inner_graph_x, inner_graph_y + inner_graph_height), 1)
-
-        for key in active_keys_to_draw:
-            if key not in species_map: continue
-            line_color, history = species_map[key]
-            data_to_plot = history
-            if not full_history_mode and const.GRAPH_MAX_HISTORY > 0 and len(history) > const.GRAPH_MAX_HISTORY:
-                data_to_plot = history[-const.GRAPH_MAX_HISTORY:]
-            num_points_to_draw = len(data_to_plot)
-            if num_points_to_draw < (1 if full_history_mode and num_points_to_draw == 1 else 2): continue
-            point_spacing_x = inner_graph_width/(num_points_to_draw-1) if num_points_to_draw > 1 else 0
-            points = []
-            for i, pop_count in enumerate(data_to_plot):
-                x = inner_graph_x + (i * point_spacing_x if num_points_to_draw > 1 else 0)
-                y_val_norm = pop_count / max_pop_overall if max_pop_overall > 0 else 0
-                y = inner_graph_y + inner_graph_height * (1 - y_val_norm)
-                points.append((x, y))
-            if len(points) >= 2: pygame.draw.lines(surface_to_draw_on, line_color, False, points, const.GRAPH_LINE_THICKNESS)
-            elif len(points) == 1: pygame.draw.circle(surface_to_draw_on, line_color, points[0], const.GRAPH_LINE_THICKNESS +1)
-
-        font_to_use = self.graph_font
-        graph_mode_display = self.graph_mode
-        if full_history_mode: graph_mode_display = 'ALL (Saved)'
-        elif self.graph_mode not in ['A', 'B', 'C']: graph_mode_display = 'ALL'
-        
-        title_text_content = f"Mode: {graph_mode_display.upper()}"
-        if full_history_mode: title_text_content = f"Full History (Tick: {self.current_tick})"
-        title_surf = font_to_use.render(title_text_content, True, const.GRAPH_TEXT_COLOR)
-        surface_to_draw_on.blit(title_surf, (graph_rect.centerx - title_surf.get_width() // 2, graph_rect.top + 5))
-
-        max_pop_text = f"Max: {max_pop_overall}"
-        max_pop_surf = font_to_use.render(max_pop_text, True, const.GRAPH_TEXT_COLOR)
-        surface_to_draw_on.blit(max_pop_surf, (inner_graph_x + 5, graph_rect.top + 5 + title_surf.get_height()))
-
-        x_label_text = "Time (Ticks)"
-        x_label_surf = font_to_use.render(x_label_text, True, const.GRAPH_TEXT_COLOR)
-        surface_to_draw_on.blit(x_label_surf, (graph_rect.centerx - x_label_surf.get_width() // 2, graph_rect.bottom - const.GRAPH_PADDING - x_label_surf.get_height() + 5 ))
-
-        y_label_text = "Population"
-        y_label_surf = font_to_use.render(y_label_text, True, const.GRAPH_TEXT_COLOR)
-        y_label_surf_rotated = pygame.transform.rotate(y_label_surf, 90)
-        surface_to_draw_on.blit(y_label_surf_rotated, (graph_rect.left + 5, graph_rect.centery - y_label_surf_rotated.get_height() // 2))
-        
-        # 범례 (화면 표시 시, 공간이 협소하면 일부만 표시하거나 다르게 배치)
-        if not full_history_mode and (self.graph_mode == 'all' or len(active_keys_to_draw) > 1):
-            legend_y_start = graph_rect.bottom - const.GRAPH_PADDING - x_axis_label_space - const.GRAPH_PADDING  # X축 위, 패딩 고려
-            max_legend_items_fit_on_screen = 4 # 예시, 화면 공간에 따라 조절
-            
-            items_drawn = 0
-            for key in active_keys_to_draw: # 모든 활성 키에 대해 시도
-                if items_drawn >= max_legend_items_fit_on_screen and len(active_keys_to_draw) > max_legend_items_fit_on_screen:
-                    # "et al." 또는 "..." 같은 표시 추가 가능
-                    etc_surf = font_to_use.render("...", True, const.GRAPH_TEXT_COLOR)
-                    surface_to_draw_on.blit(etc_surf, (inner_graph_x + 5, legend_y_start - (items_drawn * legend_space_per_item) ))
-                    break
-
-                if key in species_map:
-                    color, _ = species_map[key]
-                    legend_text = f"{key}"
-                    legend_surf = font_to_use.render(legend_text, True, color)
-                    current_legend_y = legend_y_start - (items_drawn * legend_space_per_item) - legend_surf.get_height()
-                    if current_legend_y < inner_graph_y : continue # 그래프 영역 침범 방지
-
-                    surface_to_draw_on.blit(legend_surf, (inner_graph_x + 5, current_legend_y))
-                    pygame.draw.line(surface_to_draw_on, color, 
-                                     (inner_graph_x + legend_surf.get_width() + 10, current_legend_y + legend_surf.get_height()//2), 
-                                     (inner_graph_x + legend_surf.get_width() + 30, current_legend_y + legend_surf.get_height()//2), 2)
-                    items_drawn += 1
-        elif full_history_mode : # 저장시 범례
-            legend_y_start = graph_rect.top + title_space + max_pop_text_height + const.GRAPH_PADDING
-            legend_x_start = inner_graph_x + inner_graph_width + const.GRAPH_PADDING # 그래프 오른쪽에 범례 표시 (공간이 있다면)
-            if legend_x_start + 100 > graph_rect.right : # 공간 부족 시 그래프 아래쪽
-                 legend_x_start = inner_graph_x
-                 legend_y_start = inner_graph_y + inner_graph_height + const.GRAPH_PADDING + 5
-
-            for key in self.species_ids: # 저장 시 모든 종 범례
-                if key in species_map:
-                    color, _ = species_map[key]
-                    legend_text = f"{key}"
-                    legend_surf = font_to_use.render(legend_text, True, color)
-                    if legend_y_start + legend_surf.get_height() > graph_rect.bottom - const.GRAPH_PADDING: # 범례가 영역을 벗어나면 중단
-                        break 
-                    surface_to_draw_on.blit(legend_surf, (legend_x_start, legend_y_start))
-                    pygame.draw.line(surface_to_draw_on, color, 
-                                     (legend_x_start + legend_surf.get_width() + 5, legend_y_start + legend_surf.get_height()//2), 
-                                     (legend_x_start + legend_surf.get_width() + 25, legend_y_start + legend_surf.get_height()//2), 2)
-                    legend_y_start += legend_surf.get_height() + 2
-
-
-
-    def _draw_hud(self):
+        draw_population_graph(target_surface if target_surface else self.screen,
+                              graph_rect_override if graph_rect_override else self.graph_surface_rect,
+                              history_data_override if history_data_override else self.population_history,
+                              self.graph_font, self.graph_mode, full_history_mode, self.current_tick)
+
+
+    def _get_hud_status_lines(self):
+        """HUD 오른쪽 위에 표시할 부가 상태 문자열 목록"""
+        lines = [f"View: x{self.camera.zoom:.2f} (World {const.WORLD_WIDTH}x{const.WORLD_HEIGHT})"]
+        if self.creature_pool:
+            lines.append(f"Pool hit: {self.creature_pool.hit_rate() * 100:.0f}%")
+        lines.extend(self.run_statistics.hud_lines())
+        if self.graph_window_ticks:
+            lines.append(f"Graph: last {self.graph_window_ticks} ticks")
+        if self.graph_saver:
+            graph_save_status = self.graph_saver.status_line()
+            if graph_save_status: lines.append(graph_save_status)
+        if self.quality_controller:
+            lines.append(self.quality_controller.hud_line())
+        if self.frame_capture:
+            lines.append(f"REC {self.frame_capture.frames_submitted} (drop {self.frame_capture.frames_dropped})")
+        return lines
+
+    def _draw_hud(self, refresh=True):
+        """HUD를 그립니다. refresh=False이면 마지막으로 렌더링한 문자열을 다시 사용합니다."""
+        if refresh or self._hud_blits is None: self._hud_blits = self._build_hud_blits()
+        self.screen.blits(self._hud_blits, doreturn=False)
+
+    def _build_hud_blits(self):
+        """HUD 문자열을 렌더링해 (surface, 위치) 목록으로 반환합니다."""
+        hud_blits = []
         hud_rect = const.HUD_AREA_RECT
         status_text = "Status: Paused" if self.is_paused else f"Status: Running (Speed: x{self.current_simulation_speed_factor:.1f})"
         
@@ -405,9 +383,16 @@ class Simulation:
 
         for line in base_hud_info:
             text_surface = self.hud_font.render(line, True, const.GREY)
-            self.screen.blit(text_surface, (hud_rect.left + 5, y_offset ))
+            hud_blits.append((text_surface, (hud_rect.left + 5, y_offset )))
             y_offset += line_height
         
+        # 부가 상태 정보는 HUD 오른쪽 위에 오른쪽 정렬로 표시
+        status_y_offset = hud_rect.top + 5
+        for line in self._get_hud_status_lines():
+            text_surface = self.hud_font.render(line, True, const.GREY)
+            hud_blits.append((text_surface, (hud_rect.right - 5 - text_surface.get_width(), status_y_offset)))
+            status_y_offset += line_height
+
         y_offset += 5 # 섹션 간 간격
 
         # 종별 정보 표시 (2열로 나누어 표시 시도)
@@ -415,10 +400,13 @@ class Simulation:
         current_column_x = hud_rect.left + 5
         start_y_for_species = y_offset
 
+        populations = self._get_population_counts()
         for i, species_id in enumerate(self.species_ids):
-            pop_count = len(getattr(self, f"creatures_{species_id.lower()}"))
+            pop_count = populations[species_id]
             luck_val = self.species_luck.get(species_id, const.LUCK_DEFAULT)
-            species_text = f"{species_id}: {pop_count} (L: {luck_val:.2f})"
+            species_stats = self.run_statistics.species[species_id]
+            species_text = f"{species_id}: {pop_count} (L: {luck_val:.2f}, avg {species_stats.mean:.0f}±{species_stats.std():.0f})"
+            if species_id == 'A' and self.super_individuals: species_text += f" [{len(self.creatures_a)} agents]"
             text_surface = self.hud_font.render(species_text, True, const.GREY)
             
             if y_offset + line_height > hud_rect.bottom - 5 : # HUD 영역을 벗어나면 다음 열로
@@ -427,58 +415,192 @@ class Simulation:
                  if current_column_x + column_width > hud_rect.right: # 두 번째 열도 꽉차면 중단
                       break
 
-            self.screen.blit(text_surface, (current_column_x, y_offset))
+            hud_blits.append((text_surface, (current_column_x, y_offset)))
             y_offset += line_height
-
+        return hud_blits
+
+
+    def open_history_store(self, path, resume_from_tick=None):
+        """전체 이력을 path의 메모리 맵 파일에 기록합니다.
+
+        resume_from_tick이 주어지면 기존 파일의 그 틱 이후 기록을 잘라내고, 남은 마지막 기록의 틱/종별 운과
+        최근 GRAPH_MAX_HISTORY 틱의 개체 수 이력을 불러와 그 틱부터 이어 갑니다 (개체 배치는 현재 시뮬레이션 것을 사용).
+        재개는 아직 진행하지 않은 시뮬레이션(틱 0)이나 같은 틱에서만 가능합니다. 재개 없이 기존 파일을 열면 FileExistsError.
+        """
+        if resume_from_tick is not None and self.current_tick not in (0, resume_from_tick):
+            raise ValueError(f"cannot resume history at tick {resume_from_tick} from simulation tick {self.current_tick}")
+        if self.history_store: self.history_store.close(); self.history_store = None
+        self.history_store = MappedHistoryStore(path, resume_from_tick=resume_from_tick)
+        if resume_from_tick is None or self.history_store.record_count == 0: return
+
+        record_count = self.history_store.record_count
+        start = max(0, record_count - const.GRAPH_MAX_HISTORY) if const.GRAPH_MAX_HISTORY > 0 else 0
+        recent = self.history_store.read_range(start)
+        self.current_tick = recent['tick'][-1]
+        for sid in self.species_ids:
+            self.population_history[sid] = recent[sid]
+            self.species_luck[sid] = recent['luck'][sid][-1]
+        for creature_list, sid in zip(self._get_all_creature_lists(), self.species_ids):
+            for creature in creature_list: creature.luck = self.species_luck[sid]
+
+    def _zoom_graph(self, factor):
+        window = (self.graph_window_ticks or const.GRAPH_MAX_HISTORY) * factor
+        max_window = self.history_store.record_count if self.history_store else const.GRAPH_MAX_HISTORY
+        window = int(max(const.GRAPH_MIN_WINDOW_TICKS, min(window, max(max_window, const.GRAPH_MAX_HISTORY))))
+        self.graph_window_ticks = None if window == const.GRAPH_MAX_HISTORY else window
+
+    def _get_graph_history(self):
+        """그래프 패널에 표시할 이력. 확대/축소 창이 메모리 이력보다 길면 이력 저장소에서 솎아 읽습니다."""
+        if self.graph_window_ticks is None: return None
+        if self.history_store and self.graph_window_ticks > const.GRAPH_MAX_HISTORY:
+            return self.history_store.read_population_history(last_ticks=self.graph_window_ticks,
+                                                              max_points=const.GRAPH_AREA_WIDTH)
+        return {sid: history[-self.graph_window_ticks:] for sid, history in self.population_history.items()}
 
     def _save_graph_as_image(self):
-        history_to_save = self.population_history
-        if not any(any(hist_list) for hist_list in history_to_save.values()):
-            print("Graph Save: No population data to save."); return
-
-        max_ticks_recorded = 0
-        for history_list in history_to_save.values(): max_ticks_recorded = max(max_ticks_recorded, len(history_list))
-        if max_ticks_recorded == 0: print("Graph Save: History is empty."); return
-
-        save_width = const.GRAPH_SAVE_DEFAULT_WIDTH
-        if const.GRAPH_SAVE_X_PIXELS_PER_TICK > 0 and max_ticks_recorded > 0 :
-            potential_width = max_ticks_recorded * const.GRAPH_SAVE_X_PIXELS_PER_TICK + const.GRAPH_PADDING * 10 # 넓은 패딩
-            save_width = max(potential_width, const.GRAPH_SAVE_DEFAULT_WIDTH)
-        save_height = const.GRAPH_SAVE_DEFAULT_HEIGHT
-        
-        save_surface = pygame.Surface((save_width, save_height))
-        save_surface.fill(const.GRAPH_BG_COLOR)
-        save_graph_rect = save_surface.get_rect()
-        
-        original_graph_mode = self.graph_mode # 현재 그래프 모드 저장
-        self.graph_mode = 'all' # 저장 시에는 모든 종을 그리기 위해 임시 변경
-        
-        self._draw_population_graph(target_surface=save_surface, 
-                                    history_data_override=history_to_save, 
-                                    graph_rect_override=save_graph_rect, 
-                                    full_history_mode=True)
-        
-        self.graph_mode = original_graph_mode # 원래 그래프 모드로 복원
-
-        if not os.path.exists(const.GRAPH_SAVE_PATH):
-            try: os.makedirs(const.GRAPH_SAVE_PATH, exist_ok=True)
-            except OSError as e: print(f"Error creating directory {const.GRAPH_SAVE_PATH}: {e}"); return
+        """전체 이력 그래프 저장을 백그라운드 작업으로 요청합니다. 메인 루프에서는 이력 스냅샷만 만듭니다."""
+        if self.history_store: # 메모리 이력은 최근 GRAPH_MAX_HISTORY 틱뿐이므로 저장소의 전체 이력 사용
+            if self.history_store.record_count == 0: print("Graph Save: History is empty."); return
+            history_snapshot = self.history_store.snapshot()
+        else:
+            if not any(any(hist_list) for hist_list in self.population_history.values()):
+                print("Graph Save: No population data to save."); return
+            history_snapshot = {sid: list(history) for sid, history in self.population_history.items()}
+        if self.graph_saver is None: self.graph_saver = GraphSaver()
+        self.graph_saver.submit(history_snapshot, self.current_tick, self.graph_font)
+
+    def _draw_creatures(self, sample_stride=1):
+        """카메라 뷰포트 안의 개체만 공간 인덱스로 찾아 그립니다. sample_stride > 1이면 종별로 그중 일부만 그립니다."""
+        visible_rect = self.camera.visible_world_rect()
+        self.screen.set_clip(self.camera.viewport)
+        for sid in self.species_ids: # A부터 I 순서로 그림 (상위 포식자가 위에 표시)
+            visible_creatures = self.spatial_index[sid].query_rect(*visible_rect)
+            if sample_stride > 1: visible_creatures = visible_creatures[::sample_stride]
+            for creature in visible_creatures:
+                creature.draw(self.screen, self.camera)
+        self.screen.set_clip(None)
+
+    def _draw_frame(self):
+        """화면(또는 오프스크린) surface에 한 프레임을 그립니다."""
+        quality = self._get_render_quality()
+        self.screen.fill(const.BLACK)
+        if quality is None: # 최고 품질 (헤드리스, 캡처, 품질 조절 없음)
+            self._draw_creatures()
+            self._draw_hud()
+            self._draw_population_graph(history_data_override=self._get_graph_history())
+            return
+        should_refresh = self.quality_controller.should_refresh
+        self._draw_creatures(quality.creature_sample_stride)
+        self._draw_hud(refresh=should_refresh(quality.hud_refresh_frames))
+        if should_refresh(quality.graph_refresh_frames) or self._graph_panel_cache is None:
+            self._draw_population_graph(history_data_override=self._get_graph_history())
+            self._graph_panel_cache = self.screen.subsurface(self.graph_surface_rect).copy()
+        else:
+            self.screen.blit(self._graph_panel_cache, self.graph_surface_rect)
 
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        filename = f"{const.GRAPH_FILENAME_PREFIX}{self.current_tick}_{timestamp}.png"
-        full_path = os.path.join(const.GRAPH_SAVE_PATH, filename)
-        try: pygame.image.save(save_surface, full_path); print(f"Graph saved to {full_path}")
-        except pygame.error as e: print(f"Error saving graph to {full_path}: {e}")
+    def _get_render_quality(self):
+        """현재 품질 단계 설정. 최고 품질로 그려야 하면 (캡처 중 포함) None."""
+        if self.quality_controller is None or self.frame_capture: return None
+        if self.quality_controller.level == 0: return None
+        return self.quality_controller.settings
 
+    def _invalidate_render_caches(self):
+        self._hud_blits = None
+        self._graph_panel_cache = None
 
     def _render(self):
-        self.screen.fill(const.BLACK)
-        # 모든 종 개체 그리기
-        for creature_list in self._get_all_creature_lists():
-            for creature in creature_list: creature.draw(self.screen)
-        self._draw_hud()
-        self._draw_population_graph()
-        pygame.display.flip()
+        self._draw_frame()
+        if not self.headless: pygame.display.flip()
+
+    def _get_tick_phases(self):
+        """한 틱을 구성하는 단계 (이름, 함수) 목록 (실행 순서)"""
+        return (
+            ('spawn', self._spawn_creature_a),
+            ('actions', self._update_creatures_actions),
+            ('age', self._update_creatures_age),
+            ('deaths', self._process_deaths_and_energy_return),
+            ('rebalance', self._rebalance_super_individuals),
+            ('luck', self._update_luck_system),
+            ('history', self._update_population_history),
+            ('statistics', self._update_run_statistics),
+        )
+
+    def _advance_tick(self, phase_callback=None):
+        """시뮬레이션을 한 틱 진행합니다. phase_callback(단계 이름)이 주어지면 각 단계 직후 호출합니다."""
+        self.current_tick += 1
+        for phase_name, phase in self._get_tick_phases():
+            phase()
+            if phase_callback: phase_callback(phase_name)
+
+    def _update_run_statistics(self):
+        self.run_statistics.update(self.current_tick, self._get_population_counts(), self.species_luck)
+
+    def _get_population_counts(self):
+        """종별 현재 개체 수 (슈퍼 개체 모드에서는 에이전트 수가 아닌 실제 개체 수)"""
+        populations = {sid: len(getattr(self, f"creatures_{sid.lower()}")) for sid in self.species_ids}
+        if self.super_individuals: populations['A'] = total_weight(self.creatures_a)
+        return populations
+
+    def enable_frame_capture(self, frame_capture, ticks_per_frame=None):
+        """프레임 캡처를 켭니다. 캡처 중에는 벽시계 대신 프레임당 고정 틱 수로 진행합니다."""
+        self.frame_capture = frame_capture
+        if ticks_per_frame: self.capture_ticks_per_frame = max(1, int(ticks_per_frame))
+
+    def _toggle_frame_capture(self):
+        if self.frame_capture:
+            self._stop_frame_capture()
+        else:
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            output_dir = os.path.join(const.CAPTURE_SAVE_PATH, f"capture_{self.current_tick}_{timestamp}")
+            self.enable_frame_capture(FrameCapture(output_dir))
+            print(f"Capture started: {output_dir}")
+
+    def print_memory_report(self):
+        """메모리 보고서를 출력합니다. 두 번째 호출부터 이전 보고서 이후의 증가분이 포함됩니다."""
+        if self.memory_reporter is None: self.memory_reporter = MemoryReporter() # 보고가 꺼져 있었으면 지금부터 추적
+        self.memory_reporter.print_report(self)
+
+    def _get_cached_surfaces(self):
+        """메모리 보고서용: 유지 중인 surface 목록"""
+        surfaces = {"screen": self.screen}
+        if self.frame_capture and self.frame_capture._scaled_surface:
+            surfaces["capture_scaled"] = self.frame_capture._scaled_surface
+        return surfaces
+
+    def _stop_frame_capture(self):
+        if self.frame_capture:
+            self.frame_capture.close()
+            self.frame_capture = None
+
+    def _export_run_statistics(self):
+        if not const.STATS_EXPORT_ON_EXIT or self.run_statistics.ticks == 0: return
+        try: print(f"Run statistics saved to {self.run_statistics.export(self.current_tick)}")
+        except OSError as e: print(f"Error saving run statistics: {e}")
+
+    def close(self):
+        """캡처와 작업자 스레드 등 실행 중 자원을 정리합니다."""
+        self._stop_frame_capture()
+        if self.graph_saver: # 대기 중인 그래프 저장을 마친 뒤 이력 저장소를 닫음
+            self.graph_saver.close()
+            self.graph_saver = None
+        if self.parallel_stepper: self.parallel_stepper.close()
+        if self.history_store:
+            self.history_store.close()
+            self.history_store = None
+
+    def _advance_due_ticks(self, ticks_due, tick_start):
+        """밀린 틱을 품질 단계의 프레임당 최대 틱 수까지 진행하고, 진행한 틱 수를 반환합니다.
+        렌더링 후 남는 프레임 시간을 넘기면 (최소 한 틱 진행 후) 중단합니다."""
+        if self.quality_controller is None:
+            self._advance_tick(); return 1
+        ticks_to_run = min(ticks_due, self.quality_controller.settings.max_ticks_per_frame)
+        budget_ms = self.quality_controller.tick_budget_ms()
+        ticks_run = 0
+        while ticks_run < ticks_to_run:
+            self._advance_tick()
+            ticks_run += 1
+            if (time.perf_counter() - tick_start) * 1000 >= budget_ms: break
+        return ticks_run
 
     def run(self):
         self.is_running = True
@@ -490,15 +612,39 @@ class Simulation:
             effective_speed_factor = max(0.01, self.current_simulation_speed_factor)
             tick_interval_ms = (const.SIMULATION_TICK_RATE / effective_speed_factor) * 1000
             
+            tick_start = time.perf_counter()
+            ticks_run = 0
             if not self.is_paused:
-                if (current_time_ms - self.last_simulation_update_time) >= tick_interval_ms:
+                if self.frame_capture: # 캡처 모드: 프레임당 고정 틱 수
+                    for _ in range(self.capture_ticks_per_frame): self._advance_tick()
+                elif (current_time_ms - self.last_simulation_update_time) >= tick_interval_ms:
+                    ticks_due = int((current_time_ms - self.last_simulation_update_time) // tick_interval_ms)
                     self.last_simulation_update_time = current_time_ms
-                    self.current_tick += 1
-                    self._spawn_creature_a()
-                    self._update_creatures_actions()
-                    self._update_creatures_age()
-                    self._process_deaths_and_energy_return()
-                    self._update_luck_system()
-                    self._update_population_history()
+                    ticks_run = self._advance_due_ticks(ticks_due, tick_start)
+            render_start = time.perf_counter()
             self._render()
-            self.clock.tick(const.FPS)
\ No newline at end of file
+            if self.quality_controller and not self.frame_capture:
+                if self.quality_controller.record_frame((render_start - tick_start) * 1000,
+                                                        (time.perf_counter() - render_start) * 1000, ticks_run):
+                    self._invalidate_render_caches() # 단계가 바뀌면 이전 단계에서 만든 캐시는 버림
+            if self.frame_capture and not self.is_paused: self.frame_capture.submit(self.screen)
+            self.clock.tick(const.FPS)
+        self._export_run_statistics()
+        self.close()
+
+    def run_headless(self, num_ticks, memory_report_interval=0):
+        """창 없이 num_ticks 만큼 진행합니다. 캡처가 켜져 있으면 고정 틱 간격으로 오프스크린 렌더링 결과를 캡처합니다.
+        memory_report_interval > 0 이면 해당 틱 간격마다 메모리 보고서를 출력합니다."""
+        self.is_running = True
+        if memory_report_interval > 0: self.print_memory_report() # 기준 스냅샷
+        for _ in range(num_ticks):
+            if not self.is_running: break
+            self._advance_tick()
+            if memory_report_interval > 0 and self.current_tick % memory_report_interval == 0:
+                self.print_memory_report()
+            if self.frame_capture and self.current_tick % self.capture_ticks_per_frame == 0:
+                self._draw_frame()
+                self.frame_capture.submit(self.screen)
+        self.is_running = False
+        self._export_run_statistics()
+        self.close()
\ No newline at end of file
@@ -0,0 +1,65 @@
+# spatial.py
+
+class SpatialGrid:
+    """균일 격자 공간 인덱스. 개체를 셀 단위 버킷에 담아 영역 질의 시 전체 리스트를 훑지 않도록 합니다.
+
+    틱 진행 중에 생성(insert), 이동(update), 사망(remove) 시점마다 갱신되므로
+    렌더링은 보이는 셀만 읽고 전체 개체 수에 비례하는 재구성을 하지 않습니다.
+    버킷은 삽입 순서를 유지하는 dict(개체 -> None)이며, 개체는 자신이 속한 셀 키를 _grid_cell에 기억합니다.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.max_radius = 0 # 질의 영역 확장용 (셀 경계에 걸친 큰 개체)
+
+    def _cell_key(self, creature):
+        return (int(creature.x // self.cell_size), int(creature.y // self.cell_size))
+
+    def rebuild(self, creatures):
+        """리스트 전체로 인덱스를 다시 만듭니다 (초기화나 리스트를 통째로 바꾼 경우)."""
+        self.cells = {}
+        self.max_radius = 0
+        for creature in creatures: self.insert(creature)
+
+    def insert(self, creature):
+        key = self._cell_key(creature)
+        bucket = self.cells.get(key)
+        if bucket is None: self.cells[key] = {creature: None}
+        else: bucket[creature] = None
+        creature._grid_cell = key
+        if creature.radius > self.max_radius: self.max_radius = creature.radius
+
+    def remove(self, creature):
+        bucket = self.cells.get(getattr(creature, "_grid_cell", None))
+        if bucket is None or bucket.pop(creature, 0) is not None: return # 인덱스에 없는 개체
+        if not bucket: del self.cells[creature._grid_cell]
+
+    def update(self, creature):
+        """개체가 움직인 뒤 호출합니다. 셀이 바뀐 경우에만 버킷을 옮깁니다."""
+        key = self._cell_key(creature)
+        if key == creature._grid_cell: return
+        self.remove(creature)
+        bucket = self.cells.get(key)
+        if bucket is None: self.cells[key] = {creature: None}
+        else: bucket[creature] = None
+        creature._grid_cell = key
+
+    def query_rect(self, left, top, right, bottom):
+        """영역과 겹칠 수 있는 개체를 반환합니다 (반지름만큼 확장해 질의)."""
+        if not self.cells: return []
+        cell_size = self.cell_size
+        min_cx = int((left - self.max_radius) // cell_size); max_cx = int((right + self.max_radius) // cell_size)
+        min_cy = int((top - self.max_radius) // cell_size); max_cy = int((bottom + self.max_radius) // cell_size)
+
+        found = []
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.cells):
+            # 질의 영역의 셀 수가 채워진 셀 수보다 많으면 채워진 셀만 검사
+            for (cx, cy), bucket in self.cells.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy: found.extend(bucket)
+        else:
+            cells = self.cells
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket: found.extend(bucket)
+        return found
@@ -0,0 +1,109 @@
+# super_individual.py
+# 슈퍼 개체: 에이전트 하나가 weight마리의 실제 개체를 대표 (A 전용, 선택 기능)
+import math
+import random
+import constants as const
+from creatures import spawn_creature
+
+def total_weight(creatures):
+    """에이전트 리스트가 나타내는 실제 개체 수"""
+    return sum(creature.weight for creature in creatures)
+
+def assign_weights(creatures, total):
+    """total마리를 에이전트들에 고르게 나눠 배정하고 에너지를 가중치에 맞춥니다."""
+    if not creatures: return
+    base_weight, remainder = divmod(int(total), len(creatures))
+    for index, creature in enumerate(creatures):
+        creature.weight = base_weight + (1 if index < remainder else 0)
+        creature.current_energy_level = creature.fixed_energy_value * creature.weight
+
+def merge_into(keeper, other):
+    """other를 keeper에 합칩니다. 가중치/에너지는 합하고 위치와 나이는 가중 평균으로 정합니다."""
+    total = keeper.weight + other.weight
+    keeper.x = (keeper.x * keeper.weight + other.x * other.weight) / total
+    keeper.y = (keeper.y * keeper.weight + other.y * other.weight) / total
+    keeper.age_ticks = round((keeper.age_ticks * keeper.weight + other.age_ticks * other.weight) / total)
+    keeper.current_energy_level += other.current_energy_level
+    keeper.weight = total
+    other.weight = 0
+    other.current_energy_level = 0.0
+    other.is_alive = False
+
+class SuperIndividualBudget:
+    """A의 에이전트 수를 예산 안으로 유지합니다 (슈퍼 개체 모드는 A에만 적용).
+
+    예산을 넘으면 같은 격자 셀 안의 에이전트를 둘씩 합치고 (셀이 부족하면 셀 크기를 두 배로),
+    예산의 split_below_fraction 미만으로 줄면 가장 무거운 에이전트부터 반으로 나눠 사냥 해상도를 되찾습니다.
+    실제 개체 수(가중치 합)와 에너지 합은 합치기/나누기 전후로 같습니다.
+    """
+    def __init__(self, max_agents=None, split_below_fraction=None):
+        self.max_agents = max_agents or const.SUPER_INDIVIDUAL_A_MAX_AGENTS
+        self.split_below_fraction = (const.SUPER_INDIVIDUAL_SPLIT_BELOW_FRACTION
+                                     if split_below_fraction is None else split_below_fraction)
+        self.merges = 0
+        self.splits = 0
+
+    def rebalance(self, creatures, pool=None):
+        """조정된 에이전트 리스트를 반환합니다. 합쳐져 사라진 에이전트는 pool로 돌려보냅니다."""
+        if len(creatures) > self.max_agents:
+            return self._merge(creatures, self.max_agents, pool)
+        split_target = int(self.max_agents * self.split_below_fraction)
+        if len(creatures) < split_target:
+            self._split(creatures, split_target, pool)
+        return creatures
+
+    def hunt_probability(self, predator, target, prey_grid):
+        """접촉한 슈퍼 개체(weight > 1)를 이번 틱에 사냥할 확률.
+
+        실제 개체였다면 한 마리를 잡은 뒤 다음 개체까지 이동해야 하므로, 목표가 속한 격자 셀의
+        가중치 합으로 국소 밀도를 구해 최근접 개체 거리(0.5 / sqrt(밀도))를 추정하고,
+        그 거리를 포식자 속도로 이동하는 데 걸리는 틱 수의 역수를 확률로 씁니다 (최대 1).
+        """
+        bucket = prey_grid.cells.get(getattr(target, "_grid_cell", None))
+        cell_weight = sum(creature.weight for creature in bucket) if bucket else target.weight
+        density = max(cell_weight, target.weight) / (prey_grid.cell_size ** 2)
+        search_distance = 0.5 / math.sqrt(density)
+        speed = predator.get_current_speed()
+        if search_distance <= speed: return 1.0
+        return speed / search_distance if speed > 0 else 0.0
+
+    def _merge(self, creatures, target_count, pool):
+        cell_size = const.SPATIAL_GRID_CELL_SIZE
+        while len(creatures) > target_count:
+            merges_needed = len(creatures) - target_count
+            open_agents = {} # 셀별로 짝을 기다리는 에이전트 (한 번의 순회에서 에이전트당 최대 한 번 합침)
+            for creature in creatures:
+                key = (int(creature.x // cell_size), int(creature.y // cell_size))
+                keeper = open_agents.pop(key, None)
+                if keeper is None:
+                    open_agents[key] = creature
+                    continue
+                merge_into(keeper, creature)
+                merges_needed -= 1
+                if merges_needed == 0: break
+            merged = [creature for creature in creatures if creature.weight == 0]
+            self.merges += len(merged)
+            if pool:
+                for creature in merged: pool.release(creature)
+            creatures = [creature for creature in creatures if creature.weight > 0]
+            cell_size *= 2 # 남은 합치기는 더 넓은 셀에서
+        return creatures
+
+    def _split(self, creatures, target_count, pool):
+        heavy = sorted((creature for creature in creatures if creature.weight > 1),
+                       key=lambda creature: creature.weight, reverse=True)
+        newly_split = []
+        for creature in heavy[:target_count - len(creatures)]:
+            split_weight = creature.weight // 2
+            split_energy = creature.current_energy_level * split_weight / creature.weight
+            offset = creature.radius
+            child = spawn_creature(type(creature), creature.x + random.uniform(-offset, offset),
+                                   creature.y + random.uniform(-offset, offset), creature.luck, pool)
+            child.age_ticks = creature.age_ticks
+            child.weight = split_weight
+            child.current_energy_level = split_energy
+            creature.weight -= split_weight
+            creature.current_energy_level -= split_energy
+            newly_split.append(child)
+        self.splits += len(newly_split)
+        creatures.extend(newly_split)